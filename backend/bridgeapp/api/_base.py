@@ -4,7 +4,7 @@ import fastapi
 
 from bridgeapp import bridgeprotocol
 
-from . import models, games, deals, players, db_utils
+from . import models, games, deals, players, db_utils, password_utils, utils
 
 subapp = fastapi.FastAPI(
     title="Contract bridge API",
@@ -19,11 +19,32 @@ subapp.include_router(players.router, prefix="/players", tags=["players"])
 
 @subapp.middleware("http")
 async def add_counter_middleware(request: fastapi.Request, call_next):
-    """Add X-Counter header to the response if set"""
+    """Add X-Counter and ETag headers to the response if set
+
+    If the request is conditional, and the entity tag matches the
+    ``If-None-Match`` header, the response is replaced with a HTTP 304 response.
+    """
     request.state.counter_header_value = None
+    request.state.etag_key = None
     response = await call_next(request)
     if (counter := request.state.counter_header_value) is not None:
         response.headers[games.COUNTER_HEADER] = str(counter)
+        if request.state.etag_key is not None and response.status_code in (
+            fastapi.status.HTTP_200_OK,
+            fastapi.status.HTTP_304_NOT_MODIFIED,
+        ):
+            etag = games.game_etag(*request.state.etag_key, counter)
+            response.headers["ETag"] = etag
+            if response.status_code == fastapi.status.HTTP_200_OK and (
+                utils.etag_matches(request, etag)
+            ):
+                return fastapi.Response(
+                    status_code=fastapi.status.HTTP_304_NOT_MODIFIED,
+                    headers={
+                        games.COUNTER_HEADER: str(counter),
+                        "ETag": etag,
+                    },
+                )
     return response
 
 
@@ -53,6 +74,13 @@ def handle_rule_violation(request, ex):
     return _exception_response(fastapi.status.HTTP_409_CONFLICT, ex)
 
 
+@subapp.exception_handler(bridgeprotocol.CommandTimeoutError)
+def handle_command_timeout(request, ex):
+    """Convert :exc:`bridgeprotocol.CommandTimeoutError` into HTTP error"""
+    del request
+    return _exception_response(fastapi.status.HTTP_504_GATEWAY_TIMEOUT, ex)
+
+
 @subapp.exception_handler(db_utils.NotFoundError)
 def handle_not_found_db(request, ex):
     """Convert :exc:`db_utils.NotFoundError` into HTTP error"""
@@ -65,3 +93,10 @@ def handle_already_exists_db(request, ex):
     """Convert :exc:`db_utils.AlreadyExistsError` into HTTP error"""
     del request
     return _exception_response(fastapi.status.HTTP_409_CONFLICT, ex)
+
+
+@subapp.exception_handler(password_utils.ServiceBusyError)
+def handle_password_service_busy(request, ex):
+    """Convert :exc:`password_utils.ServiceBusyError` into HTTP error"""
+    del request
+    return _exception_response(fastapi.status.HTTP_503_SERVICE_UNAVAILABLE, ex)
@@ -1,14 +1,16 @@
 """Bridge protocol glue code for the bridgeapp API"""
 
 import asyncio
-from collections import defaultdict
+from collections import defaultdict, deque
 import logging
 import threading
+import typing
 import uuid
 
 import zmq.asyncio
 
 from bridgeapp import bridgeprotocol
+from bridgeapp.bridgeprotocol import models as base_models
 from bridgeapp.settings import settings
 
 logger = logging.getLogger(__name__)
@@ -17,42 +19,298 @@ _ctx = zmq.asyncio.Context()  # pylint: disable=abstract-class-instantiated
 _threadlocal = threading.local()
 
 
+class SharedEvent:
+    """Event shared between all producers of a game
+
+    An event about a game is typically sent to many consumers that encode it
+    identically. The encoded event is memoized, so that it is only computed once
+    per distinct key no matter how many consumers there are.
+    """
+
+    def __init__(self, event: bridgeprotocol.BridgeEvent):
+        """
+        Parameters:
+            event: The event
+        """
+        self._event = event
+        self._encoded: typing.Dict[typing.Hashable, bytes] = {}
+
+    @property
+    def event(self) -> bridgeprotocol.BridgeEvent:
+        """The event"""
+        return self._event
+
+    def encode(
+        self,
+        key: typing.Hashable,
+        encoder: typing.Callable[[bridgeprotocol.BridgeEvent], bytes],
+    ) -> bytes:
+        """Get the encoded event
+
+        Parameters:
+            key: The key identifying the encoding. The consumers using the same
+                key must use equivalent encoders.
+            encoder: The function used to encode the event, if it hasn't yet
+                been encoded with ``key``
+
+        Returns:
+            The encoded event
+        """
+        if (encoded := self._encoded.get(key)) is None:
+            encoded = self._encoded[key] = encoder(self._event)
+        return encoded
+
+
+RESYNC_EVENT_TYPE = "resync"
+"""Type of the event replacing the events dropped from a full event queue
+
+The counter of the event is the counter of the latest event dropped. A consumer
+receiving it should retrieve the state of the game again."""
+
+OverflowPolicy = typing.Literal["resync", "disconnect"]
+
+
+class EventQueueOverflowError(Exception):
+    """The consumer of an event producer failed to keep up with the events"""
+
+
+class EventQueueStats(typing.NamedTuple):
+    """Statistics about the event queues of :class:`EventDemultiplexer`"""
+
+    producers: int
+    queued_events: int
+    max_queue_depth: int
+    dropped_events: int
+
+
 class _EventProducer:
-    def __init__(self, game_id: uuid.UUID):
-        self._queue = asyncio.Queue()
+    def __init__(
+        self,
+        game_id: uuid.UUID,
+        *,
+        maxsize: int = 0,
+        overflow_policy: OverflowPolicy = "resync",
+    ):
+        self._queue = asyncio.Queue(maxsize)
         self._game_id = game_id
+        self._overflow_policy = overflow_policy
+        self._overflowed = False
+        self.dropped_events = 0
 
-    def produce(self, event: bridgeprotocol.BridgeEvent):
+    def produce(self, event: SharedEvent):
         """Produce an event about the game"""
-        self._queue.put_nowait(event)
+        if self._overflowed:
+            self.dropped_events += 1
+            return
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self._handle_overflow(event)
+
+    async def get_shared_event(self) -> SharedEvent:
+        """Get the next event about the game, wrapped in :class:`SharedEvent`
+
+        Raises:
+            :exc:`EventQueueOverflowError`: If the queue has overflown and the
+                overflow policy is to disconnect
+        """
+        if self._overflowed:
+            raise EventQueueOverflowError(
+                f"Consumer failed to keep up with events about game {self._game_id}"
+            )
+        return await self._queue.get()
 
     async def get_event(self) -> bridgeprotocol.BridgeEvent:
         """Get the next event about the game"""
-        return await self._queue.get()
+        return (await self.get_shared_event()).event
 
     @property
     def game_id(self):
         """The UUID of the game"""
         return self._game_id
 
+    @property
+    def queued_events(self) -> int:
+        """The number of events waiting to be consumed"""
+        return self._queue.qsize()
+
+    def _handle_overflow(self, event: SharedEvent):
+        self.dropped_events += self._queue.qsize() + 1
+        while not self._queue.empty():
+            self._queue.get_nowait()
+        if self._overflow_policy == "disconnect":
+            self._overflowed = True
+        else:
+            resync_event = bridgeprotocol.BridgeEvent(
+                game=self._game_id, type=RESYNC_EVENT_TYPE, counter=event.event.counter
+            )
+            self._queue.put_nowait(SharedEvent(resync_event))
+        logger.warning(
+            "Event queue for game %s overflowed, policy: %s",
+            self._game_id,
+            self._overflow_policy,
+        )
+
+
+class CachedGameState(typing.NamedTuple):
+    """Public game state stored in :class:`GameStateCache`"""
+
+    game: base_models.Game
+    counter: int
+
+
+class GameStateCache:
+    """Cache of public game states
+
+    The cache only holds the states of the games that are tracked, i.e. whose
+    events are being received by :class:`EventDemultiplexer`. The state of a
+    game is invalidated when an event with a higher counter arrives, so a cached
+    state is never older than the latest event seen.
+    """
+
+    def __init__(self):
+        self._counters: typing.Dict[uuid.UUID, int] = {}
+        self._states: typing.Dict[uuid.UUID, CachedGameState] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def track(self, game_id: uuid.UUID):
+        """Start tracking the state of a game"""
+        self._counters.setdefault(game_id, -1)
+
+    def untrack(self, game_id: uuid.UUID):
+        """Stop tracking the state of a game, and forget its cached state"""
+        self._counters.pop(game_id, None)
+        self._states.pop(game_id, None)
+
+    def is_tracked(self, game_id: uuid.UUID) -> bool:
+        """Determine if the state of a game is tracked"""
+        return game_id in self._counters
+
+    def latest_counter(self, game_id: uuid.UUID) -> typing.Optional[int]:
+        """Get the latest counter of a game
+
+        Returns:
+            The counter of the latest state or event seen, or ``None`` if the
+            game is not tracked or nothing has been seen yet
+        """
+        counter = self._counters.get(game_id, -1)
+        return counter if counter >= 0 else None
+
+    def get(self, game_id: uuid.UUID) -> typing.Optional[CachedGameState]:
+        """Get the cached public state of a game, if any"""
+        if state := self._states.get(game_id):
+            self.hits += 1
+            return state
+        self.misses += 1
+        return None
+
+    def put(self, game_id: uuid.UUID, game: base_models.Game, counter: int):
+        """Cache the public state of a game
+
+        The state is ignored if the game is not tracked, or if a newer event
+        has already been seen.
+        """
+        latest_counter = self._counters.get(game_id)
+        if latest_counter is not None and counter >= latest_counter:
+            self._counters[game_id] = counter
+            self._states[game_id] = CachedGameState(game, counter)
+
+    def update_counter(self, game_id: uuid.UUID, counter: int):
+        """Update the counter of a game, invalidating the older state"""
+        latest_counter = self._counters.get(game_id)
+        if latest_counter is not None and counter > latest_counter:
+            self._counters[game_id] = counter
+            if (state := self._states.get(game_id)) and state.counter < counter:
+                del self._states[game_id]
+
 
 class EventDemultiplexer:
-    """Demultiplexer for game events"""
+    """Demultiplexer for game events
 
-    def __init__(self, event_receiver: bridgeprotocol.BridgeEventReceiver):
+    The demultiplexer subscribes to the events about a game only while there
+    are producers for the game, so that the events about the other games are
+    filtered out by ZeroMQ before they reach the application.
+
+    The most recent events about the games subscribed to are kept in memory, so
+    that a consumer resuming from a known counter can be sent the events it
+    missed.
+    """
+
+    def __init__(
+        self,
+        event_receiver: bridgeprotocol.BridgeEventReceiver,
+        *,
+        queue_size: int = 0,
+        overflow_policy: OverflowPolicy = "resync",
+        history_size: int = 0,
+    ):
         """
         Parameters:
             event_receiver: The underlying event receiver
+            queue_size: The maximum number of events queued for a producer, or
+                zero if the queues are unbounded
+            overflow_policy: If ``"resync"``, the events in a full queue are
+                replaced with a single :data:`RESYNC_EVENT_TYPE` event. If
+                ``"disconnect"``, the consumer of the full queue gets
+                :exc:`EventQueueOverflowError`.
+            history_size: The number of recent events kept per game for
+                resuming consumers
         """
         self._event_receiver = event_receiver
+        self._queue_size = queue_size
+        self._overflow_policy = overflow_policy
+        self._history_size = history_size
         self._producers = defaultdict(list)
+        self._histories: typing.Dict[uuid.UUID, typing.Deque[SharedEvent]] = {}
+        self._game_states = GameStateCache()
+        self._dropped_events = 0
+
+    @property
+    def game_states(self) -> GameStateCache:
+        """The cache of the states of the games subscribed to"""
+        return self._game_states
 
-    def subscribe(self, game_id: uuid.UUID):
-        """Subscribe to events about a game"""
+    @property
+    def queue_stats(self) -> EventQueueStats:
+        """Statistics about the event queues of the producers"""
+        producers = [
+            producer
+            for producers_for_game in self._producers.values()
+            for producer in producers_for_game
+        ]
+        queue_depths = [producer.queued_events for producer in producers]
+        return EventQueueStats(
+            producers=len(producers),
+            queued_events=sum(queue_depths),
+            max_queue_depth=max(queue_depths, default=0),
+            dropped_events=self._dropped_events
+            + sum(producer.dropped_events for producer in producers),
+        )
+
+    def subscribe(self, game_id: uuid.UUID, *, since: typing.Optional[int] = None):
+        """Subscribe to events about a game
+
+        Parameters:
+            game_id: The UUID of the game
+            since: If given, the counter of the latest event the consumer has
+                seen. The producer first produces the events after it, or a
+                single :data:`RESYNC_EVENT_TYPE` event if the missed events
+                are not known.
+        """
         if not self._producers:
             loop = asyncio.get_running_loop()
             loop.create_task(self._produce_events())
-        producer = _EventProducer(game_id)
+        producer = _EventProducer(
+            game_id, maxsize=self._queue_size, overflow_policy=self._overflow_policy
+        )
+        if not self._producers[game_id]:
+            self._event_receiver.subscribe_game(game_id)
+            self._game_states.track(game_id)
+            self._histories[game_id] = deque(maxlen=self._history_size)
+        if since is not None:
+            for shared_event in self._get_missed_events(game_id, since):
+                producer.produce(shared_event)
         self._producers[game_id].append(producer)
         return producer
 
@@ -60,8 +318,32 @@ class EventDemultiplexer:
         """Unsubscribe from events about a game"""
         producers_for_game = self._producers[producer.game_id]
         producers_for_game.remove(producer)
+        self._dropped_events += producer.dropped_events
         if not producers_for_game:
             del self._producers[producer.game_id]
+            self._event_receiver.unsubscribe_game(producer.game_id)
+            self._game_states.untrack(producer.game_id)
+            del self._histories[producer.game_id]
+
+    def _get_missed_events(self, game_id: uuid.UUID, since: int):
+        latest_counter = self._game_states.latest_counter(game_id)
+        if latest_counter is not None and since >= latest_counter:
+            return []
+        # The history is only usable if it reaches back to the latest event the
+        # consumer has seen
+        history = self._histories[game_id]
+        if history and history[0].event.counter <= since:
+            return [
+                shared_event
+                for shared_event in history
+                if shared_event.event.counter > since
+            ]
+        resync_event = bridgeprotocol.BridgeEvent(
+            game=game_id,
+            type=RESYNC_EVENT_TYPE,
+            counter=latest_counter if latest_counter is not None else 0,
+        )
+        return [SharedEvent(resync_event)]
 
     async def _produce_events(self):
         while self._producers:
@@ -70,18 +352,25 @@ class EventDemultiplexer:
             except:  # pylint: disable=bare-except
                 logger.warning("Error while producing an event", exc_info=True)
             else:
+                self._game_states.update_counter(event.game, event.counter)
                 if producers := self._producers.get(event.game):
+                    shared_event = SharedEvent(event)
+                    self._histories[event.game].append(shared_event)
                     for producer in producers[:]:
-                        producer.produce(event)
+                        producer.produce(shared_event)
                     await asyncio.sleep(0)
 
 
-async def get_bridge_client() -> bridgeprotocol.BridgeClient:
-    """Create thread local BridgeClient object"""
+async def get_bridge_client() -> bridgeprotocol.BridgeClientPool:
+    """Create thread local BridgeClientPool object"""
     if client := getattr(_threadlocal, "client", None):
         return client
-    client = await bridgeprotocol.BridgeClient.create(
-        _ctx, settings.backend_endpoint, curve_keys=settings.curve_keys
+    client = await bridgeprotocol.BridgeClientPool.create(
+        _ctx,
+        settings.backend_endpoint,
+        size=settings.backend_client_pool_size,
+        curve_keys=settings.curve_keys,
+        timeout=settings.backend_timeout,
     )
     _threadlocal.client = client
     return client
@@ -91,12 +380,20 @@ def get_event_demultiplexer() -> EventDemultiplexer:
     """Create thread local EventDemultiplexer object"""
     if demultiplexer := getattr(_threadlocal, "demultiplexer", None):
         return demultiplexer
-    demultiplexer = EventDemultiplexer(_create_event_receiver())
+    demultiplexer = EventDemultiplexer(
+        _create_event_receiver(),
+        queue_size=settings.event_queue_size,
+        overflow_policy=settings.event_queue_overflow_policy,
+        history_size=settings.event_history_size,
+    )
     _threadlocal.demultiplexer = demultiplexer
     return demultiplexer
 
 
 def _create_event_receiver():
     return bridgeprotocol.BridgeEventReceiver(
-        _ctx, settings.backend_event_endpoint, curve_keys=settings.curve_keys
+        _ctx,
+        settings.backend_event_endpoint,
+        curve_keys=settings.curve_keys,
+        subscribe_all=False,
     )
@@ -1,33 +1,174 @@
 """
 API authentication services
 ---------------------------
+
+Players authenticate either with HTTP Basic authentication, or with a bearer
+token obtained by creating a session. The session tokens are stateless: a token
+contains the identity of the player and its expiration time, signed with
+HMAC. Verifying a token requires neither database access nor deriving a
+password hash.
 """
 
+import base64
+import binascii
 import contextlib
+import datetime
+import hashlib
+import hmac
+import secrets
+import time
+import typing
+import uuid
 
 import fastapi
+import orjson
 
 from bridgeapp import db
+from bridgeapp.settings import settings
+
+from . import cache_utils, db_utils, password_utils
+
+_basic_security = fastapi.security.HTTPBasic(auto_error=False)
+_bearer_security = fastapi.security.HTTPBearer(auto_error=False)
+
+# The cache maps usernames to the digest of the verified password and the
+# player. The digest is keyed with a secret generated per process so that the
+# cached digests are useless outside the process.
+_digest_key = secrets.token_bytes(32)
+_credentials_cache = cache_utils.LRUCache(
+    settings.auth_cache_size, ttl=settings.auth_cache_ttl
+)
+
+
+class AuthenticatedPlayer(typing.NamedTuple):
+    """The identity of an authenticated player"""
+
+    id: uuid.UUID
+    username: str
+
+
+def _password_digest(password: str) -> bytes:
+    return hmac.new(_digest_key, password.encode(), hashlib.sha256).digest()
+
 
-from . import db_utils
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def _token_signature(payload: bytes) -> bytes:
+    key = settings.session_secret_key.get_secret_value().encode()
+    return hmac.new(key, payload, hashlib.sha256).digest()
+
+
+def create_session_token(
+    player: AuthenticatedPlayer,
+) -> typing.Tuple[str, datetime.datetime]:
+    """Create a session token for a player
+
+    Parameters:
+        player: The authenticated player
+
+    Returns:
+        A tuple containing the token, and its expiration time, respectively
+    """
+    expires = int(time.time() + settings.session_ttl)
+    payload = orjson.dumps(
+        {"id": str(player.id), "username": player.username, "exp": expires}
+    )
+    token = f"{_b64encode(payload)}.{_b64encode(_token_signature(payload))}"
+    return token, datetime.datetime.fromtimestamp(expires, datetime.timezone.utc)
 
-_security = fastapi.security.HTTPBasic()
+
+def verify_session_token(token: str) -> typing.Optional[AuthenticatedPlayer]:
+    """Verify a session token
+
+    Parameters:
+        token: The token created by :func:`create_session_token()`
+
+    Returns:
+        The authenticated player, or ``None`` if the token is invalid or expired
+    """
+    try:
+        encoded_payload, encoded_signature = token.split(".")
+        payload = _b64decode(encoded_payload)
+        signature = _b64decode(encoded_signature)
+    except (ValueError, binascii.Error):
+        return None
+    if not hmac.compare_digest(signature, _token_signature(payload)):
+        return None
+    try:
+        claims = orjson.loads(payload)
+        if claims["exp"] <= time.time():
+            return None
+        return AuthenticatedPlayer(
+            id=uuid.UUID(claims["id"]), username=claims["username"]
+        )
+    except (orjson.JSONDecodeError, KeyError, TypeError, ValueError):
+        return None
+
+
+def invalidate_player(username: str):
+    """Invalidate cached credentials of a player
+
+    This function must be called whenever the credentials of a player change.
+
+    Parameters:
+        username: The username of the player
+    """
+    _credentials_cache.pop(username)
+
+
+async def _verify_credentials(
+    credentials: fastapi.security.HTTPBasicCredentials,
+) -> typing.Optional[AuthenticatedPlayer]:
+    digest = _password_digest(credentials.password)
+    if cached := _credentials_cache.get(credentials.username):
+        cached_digest, player = cached
+        if hmac.compare_digest(cached_digest, digest):
+            return player
+    player_row = None
+    with contextlib.suppress(db_utils.NotFoundError):
+        player_row = await db_utils.load(
+            db.players, credentials.username, key=db.players.c.username
+        )
+    if not player_row or not await password_utils.verify_password(
+        player_row.password, credentials.password
+    ):
+        return None
+    player = AuthenticatedPlayer(id=player_row.id, username=player_row.username)
+    _credentials_cache.put(credentials.username, (digest, player))
+    return player
 
 
 async def get_authenticated_player(
-    credentials: fastapi.security.HTTPBasicCredentials = fastapi.Depends(_security),
-):
+    bearer: typing.Optional[fastapi.security.HTTPAuthorizationCredentials] = (
+        fastapi.Depends(_bearer_security)
+    ),
+    credentials: typing.Optional[fastapi.security.HTTPBasicCredentials] = (
+        fastapi.Depends(_basic_security)
+    ),
+) -> AuthenticatedPlayer:
     """Get the identity of the authenticated player
 
     This function is consumed as a dependency by a FastAPI router. It reads the
-    credentials and returns the ID of the authenticated player. If verifying the
-    credentials fails, a HTTP 401 status is raised.
+    session token or the credentials and returns the authenticated player. If
+    verifying the token or the credentials fails, a HTTP 401 status is raised.
+
+    Successfully verified credentials are cached in memory for a while, so
+    repeated requests by the same player don't hit the database.
     """
     player = None
-    with contextlib.suppress(db_utils.NotFoundError):
-        player = await db_utils.load(
-            db.players, credentials.username, key=db.players.c.username
+    if bearer:
+        player = verify_session_token(bearer.credentials)
+    elif credentials:
+        player = await _verify_credentials(credentials)
+    if not player:
+        raise fastapi.HTTPException(
+            status_code=fastapi.status.HTTP_401_UNAUTHORIZED,
+            headers={"WWW-Authenticate": "Basic"},
         )
-    if not player or player.password != credentials.password:
-        raise fastapi.HTTPException(status_code=fastapi.status.HTTP_401_UNAUTHORIZED)
-    return player._mapping
+    return player
@@ -0,0 +1,139 @@
+"""
+Cache utilities
+...............
+"""
+
+import collections
+import time
+import typing
+
+K = typing.TypeVar("K")
+V = typing.TypeVar("V")
+
+
+class LRUCache(typing.Generic[K, V]):
+    """Least recently used cache with optional expiry
+
+    The cache holds at most ``maxsize`` entries. When a new entry is added to a
+    full cache, the least recently used entry is evicted. If ``ttl`` is given,
+    entries older than ``ttl`` seconds are treated as missing. If ``maxbytes``
+    is given, least recently used entries are also evicted until the total size
+    of the entries, as determined by ``sizeof``, is at most ``maxbytes``.
+
+    The cache keeps count of hits and misses in :attr:`hits` and
+    :attr:`misses` attributes, respectively.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        *,
+        ttl: typing.Optional[float] = None,
+        maxbytes: typing.Optional[int] = None,
+        sizeof: typing.Callable[[V], int] = len,
+    ):
+        """
+        Parameters:
+            maxsize: The maximum number of entries in the cache. If zero, the
+                cache is disabled.
+            ttl: The time to live of an entry in seconds, or ``None`` if the
+                entries never expire
+            maxbytes: The maximum total size of the entries in bytes, or
+                ``None`` if the size is only bounded by ``maxsize``
+            sizeof: A function returning the size of a value in bytes
+        """
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._maxbytes = maxbytes
+        self._sizeof = sizeof
+        self._entries: "collections.OrderedDict[K, typing.Tuple[float, V]]" = (
+            collections.OrderedDict()
+        )
+        self._sizes: typing.Dict[K, int] = {}
+        self._nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: K, default=None) -> typing.Optional[V]:
+        """Get an entry from the cache
+
+        Parameters:
+            key: The key of the entry
+            default: The value returned if the entry is not found
+
+        Returns:
+            The cached value, or ``default`` if not found
+        """
+        if (entry := self._entries.get(key)) is not None:
+            created, value = entry
+            if self._ttl is None or time.monotonic() - created < self._ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            self._remove(key)
+        self.misses += 1
+        return default
+
+    def put(self, key: K, value: V):
+        """Add an entry to the cache
+
+        Parameters:
+            key: The key of the entry
+            value: The value of the entry
+        """
+        if self._maxsize <= 0:
+            return
+        size = self._sizeof(value) if self._maxbytes is not None else 0
+        if self._maxbytes is not None and size > self._maxbytes:
+            self._remove(key)
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (time.monotonic(), value)
+        self._sizes[key] = size
+        self._nbytes += size
+        while len(self._entries) > self._maxsize or (
+            self._maxbytes is not None and self._nbytes > self._maxbytes
+        ):
+            self._remove(next(iter(self._entries)))
+
+    def pop(self, key: K, default=None) -> typing.Optional[V]:
+        """Remove an entry from the cache
+
+        Parameters:
+            key: The key of the entry
+            default: The value returned if the entry is not found
+
+        Returns:
+            The removed value, or ``default`` if not found
+        """
+        if (entry := self._remove(key)) is not None:
+            return entry[1]
+        return default
+
+    def clear(self):
+        """Remove all entries and reset the counters"""
+        self._entries.clear()
+        self._sizes.clear()
+        self._nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def nbytes(self) -> int:
+        """The total size of the entries in bytes
+
+        This is only tracked if the cache was created with ``maxbytes``.
+        """
+        return self._nbytes
+
+    def _remove(self, key: K):
+        entry = self._entries.pop(key, None)
+        self._nbytes -= self._sizes.pop(key, 0)
+        return entry
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
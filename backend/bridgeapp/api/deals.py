@@ -1,17 +1,65 @@
 """
 Deals endpoints
 ...............
+
+A deal that has ended never changes. The representations of ended deals are
+serialized once and cached, and served with headers allowing clients and
+intermediate caches to store them indefinitely.
 """
 
+import hashlib
+import typing
 import uuid
 
 import fastapi
+import fastapi.encoders
+import orjson
+
+from bridgeapp.bridgeprotocol import models as base_models
+from bridgeapp.settings import settings
+
+from . import cache_utils, models, utils
+
+_IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+class _SerializedDeal(typing.NamedTuple):
+    content: bytes
+    etag: str
 
-from . import models, utils
+
+# The representation depends on the base URL because of the links, so it is
+# part of the key
+_deal_cache: cache_utils.LRUCache[
+    typing.Tuple[uuid.UUID, str], _SerializedDeal
+] = cache_utils.LRUCache(
+    settings.deal_cache_size,
+    maxbytes=settings.deal_cache_bytes,
+    sizeof=lambda deal: len(deal.content),
+)
 
 router = fastapi.APIRouter()
 
 
+def _serialize_deal(deal: base_models.Deal) -> _SerializedDeal:
+    content = orjson.dumps(
+        fastapi.encoders.jsonable_encoder(models.Deal.validate(deal))
+    )
+    etag = f'"{hashlib.sha256(content).hexdigest()[:32]}"'
+    return _SerializedDeal(content, etag)
+
+
+def _deal_response(request: fastapi.Request, deal: _SerializedDeal) -> fastapi.Response:
+    headers = {"ETag": deal.etag, "Cache-Control": _IMMUTABLE_CACHE_CONTROL}
+    if utils.etag_matches(request, deal.etag):
+        return fastapi.Response(
+            status_code=fastapi.status.HTTP_304_NOT_MODIFIED, headers=headers
+        )
+    return fastapi.Response(
+        deal.content, media_type="application/json", headers=headers
+    )
+
+
 @router.get(
     "/{id}",
     name="deal_details",
@@ -19,16 +67,29 @@ router = fastapi.APIRouter()
     description="""The response contains the representation of the deal. If the deal is ongoing,
     only public state is included (so no hidden cards or tricks). If the deal
     has ended, the response contains a full description of the deal (including
-    all hands and tricks).""",
+    all hands and tricks). A deal that has ended never changes, so its
+    representation is served with a strong `ETag` header and may be cached
+    indefinitely.""",
     response_model=models.Deal,
     responses={
+        fastapi.status.HTTP_304_NOT_MODIFIED: {
+            "description": "The deal has ended, and matches the `If-None-Match` header",
+        },
         fastapi.status.HTTP_404_NOT_FOUND: {
             "model": models.Error,
             "description": "Deal not found",
-        }
+        },
     },
 )
-async def get_deal_details(id: uuid.UUID):
+async def get_deal_details(request: fastapi.Request, id: uuid.UUID):
     """Handle getting deal details"""
+    key = (id, str(request.base_url))
+    if cached_deal := _deal_cache.get(key):
+        return _deal_response(request, cached_deal)
     client = await utils.get_bridge_client()
-    return await client.get_deal(deal=id)
+    deal = await client.get_deal(deal=id)
+    if deal.phase != base_models.DealPhase.ended:
+        return deal
+    serialized_deal = _serialize_deal(deal)
+    _deal_cache.put(key, serialized_deal)
+    return _deal_response(request, serialized_deal)
@@ -5,6 +5,7 @@ Games endpoints
 
 import asyncio
 import functools
+import hashlib
 import operator
 import uuid
 import typing
@@ -19,7 +20,7 @@ from bridgeapp import db, search
 from bridgeapp.bridgeprotocol import models as base_models
 from bridgeapp.bridgeprotocol.client import _orjson_default
 
-from . import auth, db_utils, models, search_utils, utils
+from . import _bridgeprotocol, auth, db_utils, models, search_utils, utils
 
 COUNTER_HEADER = "X-Counter"
 """Header containing the running counter of game state"""
@@ -34,12 +35,21 @@ _GAME_OK_RESPONSE = {
         COUNTER_HEADER: {
             "schema": {"type": "integer"},
             "description": "Running counter that can be used to synchronize event stream",
-        }
+        },
+        "ETag": {
+            "schema": {"type": "string"},
+            "description": "Entity tag that changes whenever the counter changes",
+        },
     }
 }
 
+_GAME_NOT_MODIFIED_RESPONSE = {
+    "description": "The game has not changed since the entity tag in the `If-None-Match` header was issued",
+}
+
 _GAME_RESPONSES = {
     fastapi.status.HTTP_200_OK: _GAME_OK_RESPONSE,
+    fastapi.status.HTTP_304_NOT_MODIFIED: _GAME_NOT_MODIFIED_RESPONSE,
     fastapi.status.HTTP_404_NOT_FOUND: _GAME_NOT_FOUND_RESPONSE,
 }
 
@@ -65,6 +75,73 @@ async def _apify_players_in_game(
     }
 
 
+def _is_seated(players: base_models.PlayersInGame, player_id: uuid.UUID) -> bool:
+    return any(
+        getattr(players, position.name) == player_id
+        for position in base_models.Position
+    )
+
+
+def _get_cached_game_state(game_id: uuid.UUID, player_id: uuid.UUID):
+    # The cached state is public, so it can only be used for players who don't
+    # see any private state
+    state = utils.get_game_state_cache().get(game_id)
+    if state and not _is_seated(state.game.players, player_id):
+        return state
+    return None
+
+
+async def _get_game(game_id: uuid.UUID, player_id: uuid.UUID):
+    if state := _get_cached_game_state(game_id, player_id):
+        return state
+    client = await utils.get_bridge_client()
+    game, counter = await client.get_game(game=game_id, player=player_id)
+    if not _is_seated(game.players, player_id):
+        utils.get_game_state_cache().put(game_id, game, counter)
+    return game, counter
+
+
+async def _get_public_game(game_id: uuid.UUID):
+    cache = utils.get_game_state_cache()
+    if state := cache.get(game_id):
+        return state
+    if cache.is_tracked(game_id):
+        client = await utils.get_bridge_client()
+        game, counter = await client.get_game(game=game_id)
+        cache.put(game_id, game, counter)
+        return game, counter
+    return None
+
+
+def game_etag(game_id: uuid.UUID, player_id: uuid.UUID, counter: int) -> str:
+    """Get the entity tag of a game resource
+
+    The tag is derived from the game, the player viewing it and the running
+    counter. It is weak because the representations also contain data (like
+    player names) whose changes aren't reflected in the counter.
+    """
+    digest = hashlib.sha256(f"{game_id}:{player_id}:{counter}".encode())
+    return f'W/"{digest.hexdigest()[:32]}"'
+
+
+def _check_not_modified(
+    request: fastapi.Request, game_id: uuid.UUID, player_id: uuid.UUID
+):
+    # Tell the middleware to tag the response, and if the latest counter is
+    # already known, answer a matching conditional request without querying the
+    # backend
+    request.state.etag_key = (game_id, player_id)
+    counter = utils.get_game_state_cache().latest_counter(game_id)
+    if counter is not None:
+        etag = game_etag(game_id, player_id, counter)
+        if utils.etag_matches(request, etag):
+            request.state.counter_header_value = counter
+            raise fastapi.HTTPException(
+                status_code=fastapi.status.HTTP_304_NOT_MODIFIED,
+                headers={"ETag": etag},
+            )
+
+
 _ALL_SEATS_FILLED_QUERY = functools.reduce(
     operator.and_,
     (
@@ -156,15 +233,13 @@ async def get_game_details(
     player: uuid.UUID = fastapi.Depends(auth.get_authenticated_player),
 ):
     """Handle getting game details"""
+    _check_not_modified(request, id, player.id)
     async with db.get_connection() as connection:
         with utils.autocancel_tasks() as create_task:
             game_attrs_load = create_task(
                 db_utils.load(db.games, id, connection=connection)
             )
-            client = await utils.get_bridge_client()
-            game, request.state.counter_header_value = await client.get_game(
-                game=id, player=player.id
-            )
+            game, request.state.counter_header_value = await _get_game(id, player.id)
             players_load = create_task(
                 _apify_players_in_game(game.players, connection=connection)
             )
@@ -194,6 +269,10 @@ async def get_game_deal(
     player: uuid.UUID = fastapi.Depends(auth.get_authenticated_player),
 ):
     """Handle getting the current deal of a game"""
+    _check_not_modified(request, game_id, player.id)
+    if state := _get_cached_game_state(game_id, player.id):
+        request.state.counter_header_value = state.counter
+        return state.game.deal
     client = await utils.get_bridge_client()
     deal, request.state.counter_header_value = await client.get_game_deal(
         game=game_id, player=player.id
@@ -216,6 +295,10 @@ async def get_game_me(
     player: uuid.UUID = fastapi.Depends(auth.get_authenticated_player),
 ):
     """Handle getting self details"""
+    _check_not_modified(request, game_id, player.id)
+    if state := _get_cached_game_state(game_id, player.id):
+        request.state.counter_header_value = state.counter
+        return state.game.self
     client = await utils.get_bridge_client()
     me_, request.state.counter_header_value = await client.get_self(
         game=game_id, player=player.id
@@ -238,7 +321,10 @@ async def get_game_results(
     player: uuid.UUID = fastapi.Depends(auth.get_authenticated_player),
 ):
     """Handle getting deal results"""
-    del player
+    _check_not_modified(request, game_id, player.id)
+    if state := await _get_public_game(game_id):
+        game, request.state.counter_header_value = state
+        return game.results
     client = await utils.get_bridge_client()
     deal_results, request.state.counter_header_value = await client.get_results(
         game=game_id
@@ -260,7 +346,10 @@ async def get_game_players(
     player: uuid.UUID = fastapi.Depends(auth.get_authenticated_player),
 ):
     """Handle getting player details"""
-    del player
+    _check_not_modified(request, game_id, player.id)
+    if state := await _get_public_game(game_id):
+        game, request.state.counter_header_value = state
+        return await _apify_players_in_game(game.players)
     client = await utils.get_bridge_client()
     players, request.state.counter_header_value = await client.get_players(game=game_id)
     return await _apify_players_in_game(players)
@@ -290,12 +379,11 @@ async def post_game_players(
     game_id, position = await client.join(
         game=game_id, player=player.id, position=position
     )
-    player = {**player}
-    for key in "password", "createdAt", "updatedAt":
-        del player[key]
     await search_utils.update(
         search.GameSummary(
-            players=search.PlayersInGame(**{position.value: search.Player(**player)})
+            players=search.PlayersInGame(
+                **{position.value: search.Player(**player._asdict())}
+            )
         ),
         game_id,
     )
@@ -376,17 +464,40 @@ async def post_game_trick(
     await client.play(game=game_id, player=player.id, card=card)
 
 
+def _encode_event(
+    shared_event: _bridgeprotocol.SharedEvent, websocket: fastapi.WebSocket
+) -> bytes:
+    # The URLs in the encoded event depend on the base URL, but nothing else
+    # about the connection
+    def _encode(event):
+        event = models.BridgeEvent.from_base(event, websocket)
+        return orjson.dumps(event, default=_orjson_default)
+
+    return shared_event.encode(str(websocket.base_url), _encode)
+
+
 @router.websocket("/{game_id}/ws")
 async def games_websocket(
     game_id: uuid.UUID,
     websocket: fastapi.WebSocket,
+    since: typing.Optional[int] = fastapi.Query(
+        None, title="Counter of the latest event already seen"
+    ),
 ):
-    """Open a websocket publishing events about a game"""
+    """Open a websocket publishing events about a game
+
+    If ``since`` is given, the events missed after it are sent first. If they
+    are no longer known, a single ``resync`` event is sent instead.
+
+    If the client fails to keep up with the events, either the missed events
+    are replaced by a single ``resync`` event, or the websocket is closed with
+    code 1013, depending on the settings.
+    """
     loop = asyncio.get_running_loop()
-    with utils.subscribe_events(game_id) as producer:
+    with utils.subscribe_events(game_id, since=since) as producer:
 
         def _create_event_task():
-            return loop.create_task(producer.get_event())
+            return loop.create_task(producer.get_shared_event())
 
         def _create_recv_task():
             return loop.create_task(websocket.receive_bytes())
@@ -395,17 +506,15 @@ async def games_websocket(
         event_task = _create_event_task()
         recv_task = _create_recv_task()
         pending = {event_task, recv_task}
+        close_code = fastapi.status.WS_1000_NORMAL_CLOSURE
         try:
             while True:
                 done, pending = await asyncio.wait(
                     pending, return_when=asyncio.FIRST_COMPLETED
                 )
                 if event_task in done:
-                    event = await event_task
-                    event = models.BridgeEvent.from_base(event, websocket)
-                    await websocket.send_bytes(
-                        orjson.dumps(event, default=_orjson_default)
-                    )
+                    shared_event = await event_task
+                    await websocket.send_bytes(_encode_event(shared_event, websocket))
                     event_task = _create_event_task()
                     pending.add(event_task)
                 if recv_task in done:
@@ -414,7 +523,9 @@ async def games_websocket(
                     pending.add(recv_task)
         except fastapi.websockets.WebSocketDisconnect:
             pass
+        except _bridgeprotocol.EventQueueOverflowError:
+            close_code = fastapi.status.WS_1013_TRY_AGAIN_LATER
         finally:
             event_task.cancel()
             recv_task.cancel()
-            await websocket.close()
+            await websocket.close(code=close_code)
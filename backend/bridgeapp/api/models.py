@@ -8,6 +8,7 @@ The models in this module extend the base models.
 # Docstrings and methods come from parent in this case
 # pylint: disable=missing-class-docstring,too-few-public-methods
 
+import datetime
 import typing
 import uuid
 
@@ -92,6 +93,13 @@ class PlayerUpdate(pydantic.BaseModel):
     password: typing.Optional[pydantic.SecretStr]
 
 
+class Session(pydantic.BaseModel):
+    """Authenticated session"""
+
+    token: str
+    expires: datetime.datetime
+
+
 class PlayersInGame(pydantic.BaseModel):
     north: typing.Optional[Player]
     east: typing.Optional[Player]
@@ -0,0 +1,107 @@
+"""
+Password utilities
+..................
+
+Deriving a password hash is deliberately expensive. Doing it in the event loop
+would stall every other request handled by the worker, so hashing and verifying
+passwords are offloaded to an executor.
+"""
+
+import asyncio
+import concurrent.futures
+import typing
+
+from sqlalchemy_utils.types.password import Password
+
+from bridgeapp import db
+from bridgeapp.settings import settings
+
+
+class ServiceBusyError(Exception):
+    """Too many password hashing jobs pending"""
+
+
+def _get_context():
+    return db.players.c.password.type.context
+
+
+def _hash(secret: str) -> str:
+    return _get_context().hash(secret)
+
+
+def _verify(secret: str, hash_: bytes) -> bool:
+    return _get_context().verify(secret, hash_)
+
+
+class _HashingService:
+    def __init__(self, executor: concurrent.futures.Executor, max_pending: int):
+        self._executor = executor
+        self._max_pending = max_pending
+        self._pending = 0
+
+    async def run(self, func: typing.Callable, *args):
+        """Run ``func(*args)`` in the executor
+
+        Raises:
+            :exc:`ServiceBusyError`: If there are too many jobs pending
+        """
+        if self._pending >= self._max_pending:
+            raise ServiceBusyError("Too many password hashing jobs pending")
+        self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, func, *args)
+        finally:
+            self._pending -= 1
+
+    @property
+    def pending(self) -> int:
+        """The number of jobs pending"""
+        return self._pending
+
+
+def _create_service():
+    executor_class = (
+        concurrent.futures.ProcessPoolExecutor
+        if settings.password_hashing_executor == "process"
+        else concurrent.futures.ThreadPoolExecutor
+    )
+    executor = executor_class(max_workers=settings.password_hashing_workers)
+    return _HashingService(executor, settings.password_hashing_queue_size)
+
+
+_service = _create_service()
+
+
+async def hash_password(secret: str) -> Password:
+    """Hash a password
+
+    Parameters:
+        secret: The password in plain text
+
+    Returns:
+        The hashed password that can be stored into the ``password`` column of
+        the players table
+
+    Raises:
+        :exc:`ServiceBusyError`: If there are too many jobs pending
+    """
+    return Password(await _service.run(_hash, secret))
+
+
+async def verify_password(password: Password, secret: str) -> bool:
+    """Verify a password
+
+    Parameters:
+        password: The hashed password loaded from the database
+        secret: The password in plain text
+
+    Returns:
+        ``True`` if ``secret`` matches ``password``, ``False`` otherwise
+
+    Raises:
+        :exc:`ServiceBusyError`: If there are too many jobs pending
+    """
+    if password is None or password.hash is None:
+        return False
+    return await _service.run(_verify, secret, password.hash)
@@ -10,7 +10,7 @@ import fastapi
 
 from bridgeapp import db
 
-from . import models, db_utils as dbu, auth
+from . import models, db_utils as dbu, auth, password_utils
 
 router = fastapi.APIRouter()
 
@@ -38,7 +38,9 @@ async def post_players(
     player_id = uuid.uuid4()
     player_url = request.url_for("player_details", id=player_id)
     player_attrs = player.dict()
-    player_attrs["password"] = player.password.get_secret_value()
+    player_attrs["password"] = await password_utils.hash_password(
+        player.password.get_secret_value()
+    )
     try:
         await dbu.create(db.players, player_id, player_attrs)
     except dbu.AlreadyExistsError as ex:
@@ -61,7 +63,25 @@ async def get_player_self(
     player=fastapi.Depends(auth.get_authenticated_player),
 ):
     """Handle getting authenticated player"""
-    return player
+    return player._asdict()
+
+
+@router.post(
+    "/me/sessions",
+    name="player_self_sessions",
+    summary="Create a session for the authenticated player",
+    description="""Creates a new session for the authenticated player. The response contains a
+    token that can be used to authenticate further requests with the bearer
+    authentication scheme until the session expires.""",
+    status_code=fastapi.status.HTTP_201_CREATED,
+    response_model=models.Session,
+)
+async def post_player_self_sessions(
+    player=fastapi.Depends(auth.get_authenticated_player),
+):
+    """Handle creating a session"""
+    token, expires = auth.create_session_token(player)
+    return {"token": token, "expires": expires}
 
 
 @router.patch(
@@ -80,8 +100,11 @@ async def patch_player_self(
     """Handle getting authenticated player"""
     player_attrs = player.dict(exclude_unset=True)
     if player.password:
-        player_attrs["password"] = player.password.get_secret_value()
+        player_attrs["password"] = await password_utils.hash_password(
+            player.password.get_secret_value()
+        )
     await dbu.update(db.players, authenticated_player.id, player_attrs)
+    auth.invalidate_player(authenticated_player.username)
 
 
 @router.get(
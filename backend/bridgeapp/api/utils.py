@@ -5,20 +5,27 @@ API utilities
 
 import asyncio
 import contextlib
+import typing
 import uuid
 
+import fastapi
+
 from bridgeapp import bridgeprotocol
 
 from . import _bridgeprotocol
 
 
-async def get_bridge_client() -> bridgeprotocol.BridgeClient:
+async def get_bridge_client() -> bridgeprotocol.BridgeClientPool:
     """Get a bridge client
 
     This function returns, possibly after creating, a bridge client
     that is used to communicate with the bridge backend. It is
     settings aware.
 
+    The returned object is a pool of clients exposing the same commands as
+    :class:`bridgeapp.bridgeprotocol.BridgeClient`. Each command is sent
+    through the least busy connection in the pool.
+
     ZeroMQ sockets are not thread safe. That is why a separate client
     object is created and returned for each thread calling this
     function.
@@ -26,13 +33,50 @@ async def get_bridge_client() -> bridgeprotocol.BridgeClient:
     return await _bridgeprotocol.get_bridge_client()
 
 
+def get_game_state_cache() -> _bridgeprotocol.GameStateCache:
+    """Get the cache of public game states
+
+    The states of the games with active event subscriptions are cached, and the
+    event stream is used to invalidate them. The games without subscriptions
+    are never cached.
+    """
+    return _bridgeprotocol.get_event_demultiplexer().game_states
+
+
+def etag_matches(request: fastapi.Request, etag: str) -> bool:
+    """Determine if an entity tag matches the ``If-None-Match`` header
+
+    The comparison is weak, i.e. the ``W/`` prefix is ignored, as is
+    appropriate for ``If-None-Match``.
+
+    Parameters:
+        request: The request
+        etag: The entity tag of the current representation
+
+    Returns:
+        ``True`` if the ``If-None-Match`` header of the request matches
+        ``etag``, ``False`` otherwise
+    """
+    if_none_match = request.headers.get("If-None-Match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque_tag = etag.removeprefix("W/")
+    return any(
+        tag.strip().removeprefix("W/") == opaque_tag for tag in if_none_match.split(",")
+    )
+
+
 @contextlib.contextmanager
-def subscribe_events(game_id: uuid.UUID):
+def subscribe_events(game_id: uuid.UUID, *, since: typing.Optional[int] = None):
     """Subscribe to events from a game
 
     The return value of this function can be used as a context manager that
     yields an event producer object. It exposes `get_event()` coroutine that can
-    be used to get events about the game.
+    be used to get events about the game. The `get_shared_event()` coroutine
+    returns the events wrapped in :class:`_bridgeprotocol.SharedEvent` objects
+    that memoize their encoding for all the consumers.
 
     .. code-block:: python
 
@@ -42,12 +86,15 @@ def subscribe_events(game_id: uuid.UUID):
 
     Parameters:
         game_id: The UUID of the game
+        since: If given, the counter of the latest event already seen. The
+            missed events after it, or a ``resync`` event if they are no longer
+            known, are produced first.
 
     Returns:
         An event producer used to retrieve events about the given game
     """
     event_demultiplexer = _bridgeprotocol.get_event_demultiplexer()
-    producer = event_demultiplexer.subscribe(game_id)
+    producer = event_demultiplexer.subscribe(game_id, since=since)
     try:
         yield producer
     finally:
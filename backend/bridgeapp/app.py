@@ -25,7 +25,7 @@ application.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
-    expose_headers=[api.games.COUNTER_HEADER],
+    expose_headers=[api.games.COUNTER_HEADER, "ETag"],
 )
 
 application.add_middleware(hrefs.starlette.HrefMiddleware)
@@ -3,9 +3,11 @@
 from ._base import CurveKeys
 from .client import BridgeClient
 from .events import BridgeEvent, BridgeEventReceiver
+from .pool import BridgeClientPool
 from .exceptions import (
     ProtocolError,
     InvalidMessage,
+    CommandTimeoutError,
     CommandFailure,
     NotFoundError,
     AlreadyExistsError,
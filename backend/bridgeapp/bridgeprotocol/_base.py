@@ -20,6 +20,8 @@ logger = logging.getLogger(__name__)
 RawArgumentsInput = typing.Mapping[bytes, bytes]
 RawArgumentsOutput = typing.Dict[bytes, bytes]
 
+_TAG_SIZE = 4
+
 
 class CurveKeys(pydantic.BaseModel):  # pylint: disable=no-member,too-few-public-methods
     """Keys needed to establish a secure ZeroMQ connection"""
@@ -82,6 +84,7 @@ class ClientBase(SocketBase):
         endpoint: str,
         *,
         curve_keys: typing.Optional[CurveKeys] = None,
+        timeout: typing.Optional[float] = None,
     ):
         """
         Parameters:
@@ -89,13 +92,25 @@ class ClientBase(SocketBase):
             endpoint: The server endpoint
             curve_keys: If given, the CURVE keys that will be used to establish
                 the connection to the backend
+            timeout: The default time in seconds to wait for a reply to a
+                command, or ``None`` to wait indefinitely
         """
         socket = ctx.socket(zmq.DEALER)  # pylint: disable=no-member
         super().__init__(socket, endpoint, curve_keys=curve_keys)
+        self._timeout = timeout
         self._counter = 0
         self._replies_pending = {}
+        self._receive_task = None
 
-    async def command(self, command: str, **kwargs) -> typing.Dict[str, typing.Any]:
+    def close(self):
+        """Close the underlying sockets and stop receiving replies"""
+        if self._receive_task:
+            self._receive_task.cancel()
+        super().close()
+
+    async def command(
+        self, command: str, *, timeout: typing.Optional[float] = None, **kwargs
+    ) -> typing.Dict[str, typing.Any]:
         """Send a command to the server
 
         This method sends the command identified by ``command`` with
@@ -103,23 +118,36 @@ class ClientBase(SocketBase):
 
         Parameters:
             command: The command
+            timeout: The time in seconds to wait for the reply, or ``None`` to
+                use the default of the client
             kwargs: The command arguments as key-value pairs
 
         Returns:
             A dictionary containing the reply arguments
 
         Raises:
+            :exc:`exceptions.CommandTimeoutError`: If the reply doesn't arrive
+                in time
             :exc:`exceptions.ProtocolError`: To signal errors in the exchange
         """
         raw_command = command.encode()
         raw_command_arguments = self._serialize_all(kwargs)
         raw_reply_arguments = await self._raw_command(
-            raw_command, raw_command_arguments
+            raw_command, raw_command_arguments, timeout=timeout
         )
         return self._deserialize_all(raw_reply_arguments)
 
+    @property
+    def pending_commands(self) -> int:
+        """The number of commands waiting for reply"""
+        return len(self._replies_pending)
+
     async def _raw_command(
-        self, identifier: bytes, command_arguments: RawArgumentsInput
+        self,
+        identifier: bytes,
+        command_arguments: RawArgumentsInput,
+        *,
+        timeout: typing.Optional[float] = None,
     ) -> RawArgumentsOutput:
         """Send a raw command to the server
 
@@ -130,26 +158,49 @@ class ClientBase(SocketBase):
         Parameters:
             identifier: The command identifier frame
             command_arguments: The command arguments
+            timeout: The time in seconds to wait for the reply, or ``None`` to
+                use the default of the client
 
         Returns:
             A tuple containing the status and reply arguments, respectively
         """
-        tag = self._counter.to_bytes(2, byteorder=sys.byteorder)
-        self._counter = (self._counter + 1) % 65536
+        if timeout is None:
+            timeout = self._timeout
+        tag = self._allocate_tag()
         msg = [b"", tag, identifier, *utils.flatten_arguments(command_arguments)]
-        logger.debug("Sending message: %r", msg)
-        await self._socket.send_multipart(msg)
         # Instead of awaiting the reply directly, do it indirectly by
         # awaiting a future yielding the reply. The pending replies
         # may be fulfilled in any order in _receive_replies(), so out
         # of order replies are handled correctly.
         loop = asyncio.get_running_loop()
         reply_future = loop.create_future()
-        create_receive_task = not self._replies_pending
         self._replies_pending[tag] = reply_future
-        if create_receive_task:
-            loop.create_task(self._receive_replies())
-        return await reply_future
+        if self._receive_task is None or self._receive_task.done():
+            self._receive_task = loop.create_task(self._receive_replies())
+
+        async def _exchange():
+            logger.debug("Sending message: %r", msg)
+            await self._socket.send_multipart(msg)
+            return await reply_future
+
+        try:
+            return await asyncio.wait_for(_exchange(), timeout)
+        except asyncio.TimeoutError as ex:
+            raise exceptions.CommandTimeoutError(
+                f"No reply to command {identifier!r} in {timeout} seconds"
+            ) from ex
+        finally:
+            # If the caller gave up before the reply arrived, reclaim the tag
+            if self._replies_pending.get(tag) is reply_future:
+                del self._replies_pending[tag]
+
+    def _allocate_tag(self) -> bytes:
+        # Skip the tags still in use, in case the counter has wrapped around
+        while True:
+            tag = self._counter.to_bytes(_TAG_SIZE, byteorder=sys.byteorder)
+            self._counter = (self._counter + 1) % (1 << (8 * _TAG_SIZE))
+            if tag not in self._replies_pending:
+                return tag
 
     @abc.abstractmethod
     def _serialize(self, obj) -> bytes:
@@ -239,6 +290,7 @@ class EventReceiverBase(SocketBase):
         endpoint: str,
         *,
         curve_keys: typing.Optional[CurveKeys] = None,
+        subscribe_all: bool = True,
     ):
         """
         Parameters:
@@ -246,12 +298,28 @@ class EventReceiverBase(SocketBase):
             endpoint: The server endpoint
             curve_keys: If given, the CURVE keys that will be used to establish
                 the connection to the backend
+            subscribe_all: If ``True``, receive all events. Otherwise only the
+                events subscribed to with :meth:`subscribe()` are received.
         """
         # pylint: disable=no-member
         socket = ctx.socket(zmq.SUB)
-        socket.setsockopt(zmq.SUBSCRIBE, b"")
+        if subscribe_all:
+            socket.setsockopt(zmq.SUBSCRIBE, b"")
         super().__init__(socket, endpoint, curve_keys=curve_keys)
 
+    def subscribe(self, prefix: bytes):
+        """Subscribe to events whose tag starts with ``prefix``
+
+        The filtering happens in ZeroMQ, so the events not subscribed to are
+        never delivered to the application. Subscriptions are counted, so each
+        call must be matched by a call to :meth:`unsubscribe()`.
+        """
+        self._socket.setsockopt(zmq.SUBSCRIBE, prefix)  # pylint: disable=no-member
+
+    def unsubscribe(self, prefix: bytes):
+        """Remove subscription added by :meth:`subscribe()`"""
+        self._socket.setsockopt(zmq.UNSUBSCRIBE, prefix)  # pylint: disable=no-member
+
     async def events(self):
         """Receive events from the server
 
@@ -24,6 +24,7 @@ else:
 
 
 OptionalUuid = typing.Optional[uuid.UUID]
+OptionalTimeout = typing.Optional[float]
 
 
 _STATUS_EXCEPTION_MAP = {
@@ -43,13 +44,19 @@ def _retries_handshake(func):
             try:
                 return await func(self, *args, **kwargs)
             except exceptions.UnknownClientError:
-                await self.hello()
+                await self.hello(timeout=kwargs.get("timeout"))
 
     return wrapped
 
 
 class BridgeClient(_base.ClientBase):
-    """Client for a bridge backend server"""
+    """Client for a bridge backend server
+
+    All commands accept an optional ``timeout`` keyword argument overriding the
+    default time to wait for the reply given when constructing the client. If
+    the reply doesn't arrive in time, :exc:`exceptions.CommandTimeoutError` is
+    raised.
+    """
 
     @classmethod
     async def create(
@@ -58,6 +65,7 @@ class BridgeClient(_base.ClientBase):
         endpoint: str,
         *,
         curve_keys: typing.Optional[_base.CurveKeys] = None,
+        timeout: typing.Optional[float] = None,
     ) -> "BridgeClient":
         """Create client and perform handshake with the server
 
@@ -66,6 +74,8 @@ class BridgeClient(_base.ClientBase):
             endpoint: The server endpoint
             curve_keys: If given, the CURVE keys that will be used to establish
                 the connection to the backend
+            timeout: The default time in seconds to wait for a reply to a
+                command, or ``None`` to wait indefinitely
 
         Returns:
             An initialized client that has performed the handshake
@@ -75,7 +85,7 @@ class BridgeClient(_base.ClientBase):
             :exc:`exceptions.ProtocolError`: If performing the connection or the
                 handshake fails
         """
-        client = cls(ctx, endpoint, curve_keys=curve_keys)
+        client = cls(ctx, endpoint, curve_keys=curve_keys, timeout=timeout)
         try:
             await client.hello()
             return client
@@ -89,6 +99,7 @@ class BridgeClient(_base.ClientBase):
         endpoint: str,
         *,
         curve_keys: typing.Optional[_base.CurveKeys] = None,
+        timeout: typing.Optional[float] = None,
     ):
         """
         Parameters:
@@ -96,26 +107,34 @@ class BridgeClient(_base.ClientBase):
             endpoint: The server endpoint
             curvekeys: If given, the CURVE keys that will be used to establish
                        the connection to the backend
+            timeout: The default time in seconds to wait for a reply to a
+                command, or ``None`` to wait indefinitely
         """
-        super().__init__(ctx, endpoint, curve_keys=curve_keys)
+        super().__init__(ctx, endpoint, curve_keys=curve_keys, timeout=timeout)
         self._handshake_pending = False
         self._handshake_lock = asyncio.Lock()
 
-    async def hello(self):
+    async def hello(self, *, timeout: OptionalTimeout = None):
         """Perform handshake with the server"""
         # Just one caller should perform the handshake at one time
         self._handshake_pending = True
         async with self._handshake_lock:
             if self._handshake_pending:
-                await self.command("bridgehlo", version="0.1", role="client")
+                await self.command(
+                    "bridgehlo", version="0.1", role="client", timeout=timeout
+                )
                 self._handshake_pending = False
 
     @_retries_handshake
     async def game(
-        self, *, game: OptionalUuid = None, args: typing.Optional[typing.Mapping] = None
+        self,
+        *,
+        game: OptionalUuid = None,
+        args: typing.Optional[typing.Mapping] = None,
+        timeout: OptionalTimeout = None,
     ) -> uuid.UUID:
         """Send game command to the server"""
-        reply = await self.command("game", game=game, args=args)
+        reply = await self.command("game", game=game, args=args, timeout=timeout)
         return self._convert_reply_safe(uuid.UUID, reply, "game", command="game")
 
     @_retries_handshake
@@ -125,9 +144,12 @@ class BridgeClient(_base.ClientBase):
         game: OptionalUuid = None,
         player: OptionalUuid = None,
         position: typing.Optional[models.Position] = None,
+        timeout: OptionalTimeout = None,
     ) -> typing.Tuple[uuid.UUID, models.Position]:
         """Send join command to the server"""
-        reply = await self.command("join", game=game, player=player, position=position)
+        reply = await self.command(
+            "join", game=game, player=player, position=position, timeout=timeout
+        )
         return (
             self._convert_reply_safe(uuid.UUID, reply, "game", command="join"),
             self._convert_reply_safe(
@@ -136,16 +158,22 @@ class BridgeClient(_base.ClientBase):
         )
 
     @_retries_handshake
-    async def leave(self, *, game: uuid.UUID, player: uuid.UUID) -> models.Position:
+    async def leave(
+        self, *, game: uuid.UUID, player: uuid.UUID, timeout: OptionalTimeout = None
+    ) -> models.Position:
         """Send leave command to the server"""
-        reply = await self.command("leave", game=game, player=player)
+        reply = await self.command("leave", game=game, player=player, timeout=timeout)
         return self._convert_reply_safe(
             lambda p: p and models.Position(p), reply, "position", command="leave"
         )
 
     @_retries_handshake
     async def get_game(
-        self, *, game: uuid.UUID, player: OptionalUuid = None
+        self,
+        *,
+        game: uuid.UUID,
+        player: OptionalUuid = None,
+        timeout: OptionalTimeout = None,
     ) -> typing.Tuple[models.Game, int]:
         """Get the full state of a game from the server
 
@@ -161,6 +189,7 @@ class BridgeClient(_base.ClientBase):
             game=game,
             player=player,
             get=["pubstate", "privstate", "self", "results", "players"],
+            timeout=timeout,
         )
         return (
             self._convert_reply_safe(
@@ -171,7 +200,11 @@ class BridgeClient(_base.ClientBase):
 
     @_retries_handshake
     async def get_game_deal(
-        self, *, game: uuid.UUID, player: OptionalUuid = None
+        self,
+        *,
+        game: uuid.UUID,
+        player: OptionalUuid = None,
+        timeout: OptionalTimeout = None,
     ) -> typing.Tuple[models.Deal, int]:
         """Get the deal state from the server
 
@@ -183,7 +216,11 @@ class BridgeClient(_base.ClientBase):
             A tuple containing the deal state, and the running counter, respectively
         """
         reply = await self.command(
-            "get", game=game, player=player, get=["pubstate", "privstate"]
+            "get",
+            game=game,
+            player=player,
+            get=["pubstate", "privstate"],
+            timeout=timeout,
         )
         return (
             self._convert_reply_safe(self._create_deal, reply, "get", command="get"),
@@ -191,7 +228,9 @@ class BridgeClient(_base.ClientBase):
         )
 
     @_retries_handshake
-    async def get_deal(self, *, deal: uuid.UUID) -> models.Deal:
+    async def get_deal(
+        self, *, deal: uuid.UUID, timeout: OptionalTimeout = None
+    ) -> models.Deal:
         """Get the deal record from the server
 
         Parameters:
@@ -200,12 +239,16 @@ class BridgeClient(_base.ClientBase):
         Returns:
             A deal record
         """
-        reply = await self.command("get", deal=deal)
+        reply = await self.command("get", deal=deal, timeout=timeout)
         return self._convert_reply_safe(self._create_deal, reply, "get", command="get")
 
     @_retries_handshake
     async def get_self(
-        self, *, game: uuid.UUID, player: OptionalUuid = None
+        self,
+        *,
+        game: uuid.UUID,
+        player: OptionalUuid = None,
+        timeout: OptionalTimeout = None,
     ) -> typing.Tuple[models.PlayerState, int]:
         """Get the player state from the server
 
@@ -216,7 +259,9 @@ class BridgeClient(_base.ClientBase):
         Returns:
             A tuple containing the self state, and the running counter, respectively
         """
-        reply = await self.command("get", game=game, player=player, get=["self"])
+        reply = await self.command(
+            "get", game=game, player=player, get=["self"], timeout=timeout
+        )
         return (
             self._convert_reply_safe(
                 self._create_player_state, reply, "get", command="get"
@@ -226,7 +271,7 @@ class BridgeClient(_base.ClientBase):
 
     @_retries_handshake
     async def get_results(
-        self, *, game: uuid.UUID
+        self, *, game: uuid.UUID, timeout: OptionalTimeout = None
     ) -> typing.Tuple[typing.List[models.DealResult], int]:
         """Get the deal results from the server
 
@@ -237,7 +282,7 @@ class BridgeClient(_base.ClientBase):
         Returns:
             A tuple containing the results, and the running counter, respectively
         """
-        reply = await self.command("get", game=game, get=["results"])
+        reply = await self.command("get", game=game, get=["results"], timeout=timeout)
         return (
             self._convert_reply_safe(
                 self._create_deal_results, reply, "get", command="get"
@@ -247,7 +292,7 @@ class BridgeClient(_base.ClientBase):
 
     @_retries_handshake
     async def get_players(
-        self, *, game: uuid.UUID
+        self, *, game: uuid.UUID, timeout: OptionalTimeout = None
     ) -> typing.Tuple[models.PlayersInGame, int]:
         """Get the players in a game from the server
 
@@ -258,7 +303,7 @@ class BridgeClient(_base.ClientBase):
             A tuple containing the players in the game, and the running counter,
             respectively
         """
-        reply = await self.command("get", game=game, get=["players"])
+        reply = await self.command("get", game=game, get=["players"], timeout=timeout)
         return (
             self._convert_reply_safe(
                 self._create_players_map, reply, "get", command="get"
@@ -268,17 +313,27 @@ class BridgeClient(_base.ClientBase):
 
     @_retries_handshake
     async def call(
-        self, *, game: uuid.UUID, player: OptionalUuid = None, call: models.Call
+        self,
+        *,
+        game: uuid.UUID,
+        player: OptionalUuid = None,
+        call: models.Call,
+        timeout: OptionalTimeout = None,
     ):
         """Send call command to the server"""
-        await self.command("call", game=game, player=player, call=call)
+        await self.command("call", game=game, player=player, call=call, timeout=timeout)
 
     @_retries_handshake
     async def play(
-        self, *, game: uuid.UUID, player: OptionalUuid = None, card: models.CardType
+        self,
+        *,
+        game: uuid.UUID,
+        player: OptionalUuid = None,
+        card: models.CardType,
+        timeout: OptionalTimeout = None,
     ):
         """Send play command to the server"""
-        await self.command("play", game=game, player=player, card=card)
+        await self.command("play", game=game, player=player, card=card, timeout=timeout)
 
     def _serialize(self, obj):
         return orjson.dumps(obj, default=_orjson_default)
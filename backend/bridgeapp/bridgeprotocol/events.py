@@ -155,7 +155,24 @@ assert set(type.name for type in EventType) == set(
 
 
 class BridgeEventReceiver(_base.EventReceiverBase):
-    """Client for receiving events from a bridge backend server"""
+    """Client for receiving events from a bridge backend server
+
+    By default all events are received. If the receiver is created with
+    ``subscribe_all=False``, only the events about the games subscribed to with
+    :meth:`subscribe_game()` are received.
+    """
+
+    def subscribe_game(self, game_id: uuid.UUID):
+        """Subscribe to the events about a game"""
+        self.subscribe(self._game_prefix(game_id))
+
+    def unsubscribe_game(self, game_id: uuid.UUID):
+        """Remove subscription added by :meth:`subscribe_game()`"""
+        self.unsubscribe(self._game_prefix(game_id))
+
+    @staticmethod
+    def _game_prefix(game_id: uuid.UUID) -> bytes:
+        return f"{game_id}:".encode()
 
     @staticmethod
     def _deserialize(arg):
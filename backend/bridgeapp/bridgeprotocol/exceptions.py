@@ -12,6 +12,10 @@ class InvalidMessage(ProtocolError):
     """Error indicating invalid message received from the server"""
 
 
+class CommandTimeoutError(ProtocolError, TimeoutError):
+    """Error indicating that the server didn't reply to a command in time"""
+
+
 class CommandFailure(ProtocolError):
     """Error indicating failed command"""
 
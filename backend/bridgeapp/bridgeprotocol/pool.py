@@ -0,0 +1,160 @@
+"""Bridge client pool"""
+
+import asyncio
+import contextlib
+import functools
+import logging
+import time
+import typing
+
+import zmq.asyncio
+
+from . import _base, exceptions
+from .client import BridgeClient
+
+logger = logging.getLogger(__name__)
+
+
+def _pooled(name: str):
+    method = getattr(BridgeClient, name)
+
+    @functools.wraps(method)
+    async def wrapped(self, *args, **kwargs):
+        return await self._dispatch(name, *args, **kwargs)
+
+    return wrapped
+
+
+class BridgeClientPool(contextlib.AbstractContextManager):
+    """Pool of clients for a bridge backend server
+
+    The pool exposes the same commands as :class:`BridgeClient`. Each command is
+    dispatched to the client with the fewest commands waiting for reply, so
+    that a slow command doesn't block the commands sent after it.
+
+    A client that fails ``max_failures`` times in a row (due to other reasons
+    than the server rejecting the command) is considered unhealthy, and isn't
+    used for ``retry_after`` seconds unless all clients are unhealthy.
+    """
+
+    @classmethod
+    async def create(
+        cls,
+        ctx: zmq.asyncio.Context,
+        endpoint: str,
+        *,
+        size: int,
+        curve_keys: typing.Optional[_base.CurveKeys] = None,
+        timeout: typing.Optional[float] = None,
+        **kwargs,
+    ) -> "BridgeClientPool":
+        """Create pool and perform handshake with the server
+
+        Parameters:
+            ctx: The ZeroMQ context
+            endpoint: The server endpoint
+            size: The number of clients in the pool
+            curve_keys: If given, the CURVE keys that will be used to establish
+                the connection to the backend
+            timeout: The default time in seconds to wait for a reply to a
+                command, or ``None`` to wait indefinitely
+            kwargs: Keyword arguments passed to the constructor
+
+        Returns:
+            An initialized pool whose clients have performed the handshake
+            with the server
+
+        Raises:
+            :exc:`exceptions.ProtocolError`: If performing the connection or the
+                handshake fails
+        """
+        pool = cls(
+            [
+                BridgeClient(ctx, endpoint, curve_keys=curve_keys, timeout=timeout)
+                for _ in range(size)
+            ],
+            **kwargs,
+        )
+        try:
+            await asyncio.gather(*(client.hello() for client in pool.clients))
+            return pool
+        except:
+            pool.close()
+            raise
+
+    def __init__(
+        self,
+        clients: typing.Iterable[BridgeClient],
+        *,
+        max_failures: int = 3,
+        retry_after: float = 5.0,
+    ):
+        """
+        Parameters:
+            clients: The clients in the pool
+            max_failures: The number of consecutive failures after which a
+                client is considered unhealthy
+            retry_after: The time in seconds after which an unhealthy client
+                is used again
+        """
+        self._clients = list(clients)
+        if not self._clients:
+            raise ValueError("Expected at least one client")
+        self._max_failures = max_failures
+        self._retry_after = retry_after
+        self._failures = [0] * len(self._clients)
+        self._unhealthy_until = [0.0] * len(self._clients)
+
+    def close(self):
+        """Close the underlying clients"""
+        for client in self._clients:
+            client.close()
+
+    def __exit__(self, *exc_args):
+        self.close()
+
+    @property
+    def clients(self) -> typing.List[BridgeClient]:
+        """The clients in the pool"""
+        return list(self._clients)
+
+    def is_healthy(self, index: int) -> bool:
+        """Determine if the client at ``index`` is healthy"""
+        return self._unhealthy_until[index] <= time.monotonic()
+
+    def _select(self) -> int:
+        indices = range(len(self._clients))
+        healthy = [index for index in indices if self.is_healthy(index)]
+        return min(
+            healthy or indices, key=lambda index: self._clients[index].pending_commands
+        )
+
+    async def _dispatch(self, name: str, *args, **kwargs):
+        index = self._select()
+        try:
+            result = await getattr(self._clients[index], name)(*args, **kwargs)
+        except exceptions.CommandFailure:
+            # The server replied, so the connection itself is fine
+            self._failures[index] = 0
+            raise
+        except exceptions.ProtocolError:
+            self._failures[index] += 1
+            if self._failures[index] >= self._max_failures:
+                logger.warning("Client %d in the pool is unhealthy", index)
+                self._unhealthy_until[index] = time.monotonic() + self._retry_after
+            raise
+        self._failures[index] = 0
+        return result
+
+    hello = _pooled("hello")
+    game = _pooled("game")
+    join = _pooled("join")
+    leave = _pooled("leave")
+    get_game = _pooled("get_game")
+    get_game_deal = _pooled("get_game_deal")
+    get_deal = _pooled("get_deal")
+    get_self = _pooled("get_self")
+    get_results = _pooled("get_results")
+    get_players = _pooled("get_players")
+    call = _pooled("call")
+    play = _pooled("play")
@@ -8,10 +8,11 @@ Bridgeapp settings
 
 
 import functools
+import secrets
 import typing
 import uuid
 
-from pydantic import BaseSettings, Field, root_validator
+from pydantic import BaseSettings, Field, SecretStr, root_validator
 
 from .bridgeprotocol.utils import TCP_ENDPOINT_RE
 from .bridgeprotocol import CurveKeys
@@ -36,6 +37,71 @@ class Settings(BaseSettings):
         regex=TCP_ENDPOINT_RE.pattern,
     )
 
+    backend_client_pool_size: int = Field(
+        4,
+        title="Number of bridge backend connections per worker",
+        description="""
+The number of connections each worker opens to the bridge backend server.
+Commands are dispatched to the connection with the fewest commands waiting for
+reply.""",
+        ge=1,
+    )
+
+    backend_timeout: typing.Optional[float] = Field(
+        10.0,
+        title="Bridge backend timeout",
+        description="""
+The time in seconds to wait for the bridge backend server to reply to a command.
+If the reply doesn't arrive in time, the request fails with HTTP 504 status.""",
+        gt=0,
+    )
+
+    deal_cache_size: int = Field(
+        1024,
+        title="Size of the deal cache",
+        description="""
+The maximum number of ended deals cached in memory. A deal that has ended never
+changes, so its representation is cached instead of being retrieved from the
+bridge backend server every time. Zero disables the cache.""",
+        ge=0,
+    )
+
+    deal_cache_bytes: int = Field(
+        16 * 1024 * 1024,
+        title="Maximum total size of the deal cache in bytes",
+        ge=0,
+    )
+
+    event_queue_size: int = Field(
+        256,
+        title="Maximum number of events queued for a subscriber",
+        description="""
+The maximum number of events waiting to be sent to a single websocket. When a
+client fails to keep up with the events, the queue overflows and the overflow
+policy is applied. Zero means that the queues are unbounded.""",
+        ge=0,
+    )
+
+    event_queue_overflow_policy: typing.Literal["resync", "disconnect"] = Field(
+        "resync",
+        title="Event queue overflow policy",
+        description="""
+If "resync", the queued events are dropped and replaced by a single "resync"
+event, after which the client is expected to retrieve the game state again. If
+"disconnect", the websocket is closed.""",
+    )
+
+    event_history_size: int = Field(
+        64,
+        title="Number of recent events kept per game",
+        description="""
+The number of recent events kept in memory for each game with subscribers. A
+client reconnecting to the event stream can pass the counter of the latest event
+it has seen, and the events it missed are sent to it first. If the missed events
+are no longer known, a "resync" event is sent instead.""",
+        ge=0,
+    )
+
     curve_serverkey: typing.Optional[str] = Field(
         title="Bridge backend server key",
         description="""
@@ -71,6 +137,60 @@ on their username. This setting is used as the root namespace. It should be set
 to a known value to ensure consistent UUID generation across runs.""",
     )
 
+    auth_cache_size: int = Field(
+        1024,
+        title="Size of the authentication cache",
+        description="""
+The maximum number of verified credentials cached in memory. Successfully
+verified credentials are cached so that repeated requests by the same player
+don't need to access the database or derive the password hash again. Zero
+disables the cache.""",
+        ge=0,
+    )
+
+    auth_cache_ttl: float = Field(
+        300.0,
+        title="Time to live of the authentication cache entries",
+        description="""
+The time in seconds after which a verified credential must be verified against
+the database again.""",
+        gt=0,
+    )
+
+    session_secret_key: SecretStr = Field(
+        default_factory=lambda: SecretStr(secrets.token_urlsafe(32)),
+        title="Secret key used to sign session tokens",
+        description="""
+The key used to sign and verify the session tokens issued to the players. All
+application instances must share the same key to accept each other's tokens, so
+this should be set explicitly if running more than one worker.""",
+    )
+
+    session_ttl: float = Field(
+        12 * 60 * 60, title="Time to live of session tokens in seconds", gt=0
+    )
+
+    password_hashing_executor: typing.Literal["thread", "process"] = Field(
+        "thread",
+        title="Password hashing executor",
+        description="""
+Whether to derive password hashes in a thread pool or in a process pool. The
+hash derivation releases GIL, so a thread pool is usually sufficient.""",
+    )
+
+    password_hashing_workers: int = Field(
+        2, title="Number of password hashing workers", ge=1
+    )
+
+    password_hashing_queue_size: int = Field(
+        32,
+        title="Maximum number of pending password hashing jobs",
+        description="""
+If more password hashing jobs are pending, further requests needing password
+verification are rejected with HTTP 503 status.""",
+        ge=1,
+    )
+
     @property
     def curve_keys(self) -> typing.Optional[CurveKeys]:
         """Return curve keys from the settings"""
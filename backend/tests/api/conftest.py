@@ -10,7 +10,7 @@ import fastapi.testclient
 import pytest
 
 from bridgeapp import application, db
-from bridgeapp.api import db_utils, search_utils
+from bridgeapp.api import _bridgeprotocol, auth, db_utils, deals, search_utils
 
 
 @dataclasses.dataclass
@@ -21,6 +21,24 @@ class MockSeach:
     search: unittest.mock.AsyncMock
 
 
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """Clear in-process caches between tests"""
+    auth._credentials_cache.clear()
+    deals._deal_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def event_demultiplexer(monkeypatch):
+    """Yield event demultiplexer wrapping a mock event receiver"""
+    event_receiver = unittest.mock.Mock(get_event=unittest.mock.AsyncMock())
+    demultiplexer = _bridgeprotocol.EventDemultiplexer(event_receiver)
+    monkeypatch.setattr(
+        _bridgeprotocol, "get_event_demultiplexer", lambda: demultiplexer
+    )
+    return demultiplexer
+
+
 @pytest.fixture
 def client():
     """Yield mock client that interacts with the API"""
@@ -0,0 +1,47 @@
+import pytest
+
+from bridgeapp.api import cache_utils
+
+
+def test_lru_cache_should_evict_least_recently_used():
+    cache = cache_utils.LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+    assert "a" in cache
+    assert "b" not in cache
+    assert "c" in cache
+
+
+def test_lru_cache_should_evict_entries_exceeding_maxbytes():
+    cache = cache_utils.LRUCache(10, maxbytes=5)
+    cache.put("a", b"123")
+    cache.put("b", b"45")
+    assert cache.nbytes == 5
+    cache.put("c", b"6")
+    assert "a" not in cache
+    assert cache.nbytes == 3
+
+
+def test_lru_cache_should_not_store_value_larger_than_maxbytes():
+    cache = cache_utils.LRUCache(10, maxbytes=5)
+    cache.put("a", b"123456")
+    assert "a" not in cache
+    assert cache.nbytes == 0
+
+
+def test_lru_cache_should_account_replaced_value():
+    cache = cache_utils.LRUCache(10, maxbytes=5)
+    cache.put("a", b"123")
+    cache.put("a", b"1")
+    assert cache.nbytes == 1
+    assert cache.pop("a") == b"1"
+    assert cache.nbytes == 0
+
+
+@pytest.mark.parametrize("maxsize", [0, -1])
+def test_lru_cache_should_be_disabled_if_maxsize_not_positive(maxsize):
+    cache = cache_utils.LRUCache(maxsize)
+    cache.put("a", 1)
+    assert cache.get("a") is None
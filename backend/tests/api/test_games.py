@@ -45,17 +45,17 @@ def mock_bridge_client(monkeypatch):
 
 
 @pytest.fixture
-def mock_event_receiver(monkeypatch):
+def mock_event_receiver(event_demultiplexer):
     """Yield mock event receiver"""
-    mock = unittest.mock.Mock(get_event=unittest.mock.AsyncMock())
+    return event_demultiplexer._event_receiver
 
-    def mock_get_event_demultiplexer():
-        return api._bridgeprotocol.EventDemultiplexer(mock)
 
-    monkeypatch.setattr(
-        api._bridgeprotocol, "get_event_demultiplexer", mock_get_event_demultiplexer
-    )
-    return mock
+@pytest.fixture
+def game_state_cache(event_demultiplexer, game_id):
+    """Yield game state cache tracking the game"""
+    cache = event_demultiplexer.game_states
+    cache.track(game_id)
+    return cache
 
 
 def _receive_event_helper(websocket):
@@ -204,6 +204,14 @@ def test_read_game_should_fail_if_game_not_found(
     mock_bridge_client.get_game.assert_awaited_once()
 
 
+def test_read_game_should_fail_if_backend_times_out(
+    client, mock_bridge_client, game_id, credentials, database
+):
+    mock_bridge_client.get_game.side_effect = bridgeprotocol.CommandTimeoutError
+    res = client.get(f"/api/v1/games/{game_id}", auth=credentials)
+    assert res.status_code == fastapi.status.HTTP_504_GATEWAY_TIMEOUT
+
+
 def test_read_game_deal(
     client, mock_bridge_client, game_id, db_game, player_id, credentials
 ):
@@ -263,6 +271,39 @@ def test_read_deal_should_fail_if_deal_not_found(client, mock_bridge_client):
     mock_bridge_client.get_deal.assert_awaited_once()
 
 
+def test_read_ended_deal_should_be_cached(client, mock_bridge_client):
+    deal = models.Deal(phase=models.DealPhase.ended)
+    mock_bridge_client.get_deal.return_value = deal
+    res1 = client.get(f"/api/v1/deals/{deal.id}")
+    res2 = client.get(f"/api/v1/deals/{deal.id}")
+    assert res1.json() == res2.json()
+    assert res1.json()["phase"] == "ended"
+    assert res1.json()["self"] == f"http://testserver/api/v1/deals/{deal.id}"
+    assert res1.headers["ETag"] == res2.headers["ETag"]
+    assert "immutable" in res1.headers["Cache-Control"]
+    mock_bridge_client.get_deal.assert_awaited_once_with(deal=deal.id)
+
+
+def test_read_ongoing_deal_should_not_be_cached(client, mock_bridge_client):
+    deal = models.Deal(phase=models.DealPhase.playing)
+    mock_bridge_client.get_deal.return_value = deal
+    for _ in range(2):
+        res = client.get(f"/api/v1/deals/{deal.id}")
+        assert "ETag" not in res.headers
+    assert mock_bridge_client.get_deal.await_count == 2
+
+
+def test_read_ended_deal_should_return_not_modified_if_etag_matches(
+    client, mock_bridge_client
+):
+    deal = models.Deal(phase=models.DealPhase.ended)
+    mock_bridge_client.get_deal.return_value = deal
+    etag = client.get(f"/api/v1/deals/{deal.id}").headers["ETag"]
+    res = client.get(f"/api/v1/deals/{deal.id}", headers={"If-None-Match": etag})
+    assert res.status_code == fastapi.status.HTTP_304_NOT_MODIFIED
+    assert res.headers["ETag"] == etag
+
+
 def test_read_self(client, mock_bridge_client, game_id, player_id, credentials):
     player_state = models.PlayerState(position=models.Position.north)
     mock_bridge_client.get_self.return_value = (player_state, 123)
@@ -538,6 +579,121 @@ def test_play_card_should_fail_if_backend_fails(
     mock_bridge_client.play.assert_awaited_once()
 
 
+def _spectated_game(game_id):
+    return models.Game(id=game_id, deal=models.Deal())
+
+
+def test_read_game_should_use_cached_public_state(
+    client, mock_bridge_client, game_id, db_game, credentials, game_state_cache
+):
+    mock_bridge_client.get_game.return_value = (_spectated_game(game_id), 123)
+    for _ in range(2):
+        res = client.get(f"/api/v1/games/{game_id}", auth=credentials)
+        assert res.status_code == fastapi.status.HTTP_200_OK
+        assert res.headers[api.games.COUNTER_HEADER] == "123"
+    mock_bridge_client.get_game.assert_awaited_once()
+    assert game_state_cache.hits == 1
+
+
+def test_read_game_should_not_use_cached_state_for_seated_player(
+    client, mock_bridge_client, game_id, db_game, player_id, credentials
+):
+    game = models.Game(id=game_id, players=models.PlayersInGame(north=player_id))
+    mock_bridge_client.get_game.return_value = (game, 123)
+    for _ in range(2):
+        res = client.get(f"/api/v1/games/{game_id}", auth=credentials)
+        assert res.status_code == fastapi.status.HTTP_200_OK
+    assert mock_bridge_client.get_game.await_count == 2
+
+
+@pytest.mark.parametrize("endpoint", ["deal", "me", "results", "players"])
+def test_read_game_subresource_should_use_cached_public_state(
+    client, mock_bridge_client, game_id, credentials, game_state_cache, endpoint
+):
+    mock_bridge_client.get_game.return_value = (_spectated_game(game_id), 123)
+    game_state_cache.put(game_id, *mock_bridge_client.get_game.return_value)
+    res = client.get(f"/api/v1/games/{game_id}/{endpoint}", auth=credentials)
+    assert res.status_code == fastapi.status.HTTP_200_OK
+    assert res.headers[api.games.COUNTER_HEADER] == "123"
+    mock_bridge_client.get_game.assert_not_awaited()
+    mock_bridge_client.get_game_deal.assert_not_awaited()
+    mock_bridge_client.get_self.assert_not_awaited()
+    mock_bridge_client.get_results.assert_not_awaited()
+    mock_bridge_client.get_players.assert_not_awaited()
+
+
+def test_newer_event_should_invalidate_cached_state(
+    client, mock_bridge_client, game_id, credentials, game_state_cache
+):
+    mock_bridge_client.get_game.return_value = (_spectated_game(game_id), 123)
+    client.get(f"/api/v1/games/{game_id}/results", auth=credentials)
+    game_state_cache.update_counter(game_id, 124)
+    mock_bridge_client.get_game.return_value = (_spectated_game(game_id), 124)
+    res = client.get(f"/api/v1/games/{game_id}/results", auth=credentials)
+    assert res.headers[api.games.COUNTER_HEADER] == "124"
+    assert mock_bridge_client.get_game.await_count == 2
+
+
+def test_read_game_deal_should_return_etag(
+    client, mock_bridge_client, game_id, player_id, credentials
+):
+    mock_bridge_client.get_game_deal.return_value = (models.Deal(), 123)
+    res = client.get(f"/api/v1/games/{game_id}/deal", auth=credentials)
+    assert res.headers["ETag"] == api.games.game_etag(game_id, player_id, 123)
+
+
+def test_read_game_deal_should_return_not_modified_if_etag_matches(
+    client, mock_bridge_client, game_id, credentials
+):
+    mock_bridge_client.get_game_deal.return_value = (models.Deal(), 123)
+    etag = client.get(f"/api/v1/games/{game_id}/deal", auth=credentials).headers["ETag"]
+    res = client.get(
+        f"/api/v1/games/{game_id}/deal",
+        auth=credentials,
+        headers={"If-None-Match": etag},
+    )
+    assert res.status_code == fastapi.status.HTTP_304_NOT_MODIFIED
+    assert res.headers["ETag"] == etag
+    assert res.headers[api.games.COUNTER_HEADER] == "123"
+    assert not res.content
+
+
+def test_read_game_deal_should_return_deal_if_etag_does_not_match(
+    client, mock_bridge_client, game_id, player_id, credentials
+):
+    mock_bridge_client.get_game_deal.return_value = (models.Deal(), 124)
+    res = client.get(
+        f"/api/v1/games/{game_id}/deal",
+        auth=credentials,
+        headers={"If-None-Match": api.games.game_etag(game_id, player_id, 123)},
+    )
+    assert res.status_code == fastapi.status.HTTP_200_OK
+    assert res.headers["ETag"] == api.games.game_etag(game_id, player_id, 124)
+
+
+@pytest.mark.parametrize("endpoint", ["", "/deal", "/me", "/results", "/players"])
+def test_read_game_should_not_query_backend_if_counter_unchanged(
+    client,
+    mock_bridge_client,
+    game_id,
+    player_id,
+    credentials,
+    game_state_cache,
+    endpoint,
+):
+    game_state_cache.update_counter(game_id, 123)
+    res = client.get(
+        f"/api/v1/games/{game_id}{endpoint}",
+        auth=credentials,
+        headers={"If-None-Match": api.games.game_etag(game_id, player_id, 123)},
+    )
+    assert res.status_code == fastapi.status.HTTP_304_NOT_MODIFIED
+    assert res.headers[api.games.COUNTER_HEADER] == "123"
+    mock_bridge_client.get_game.assert_not_awaited()
+    mock_bridge_client.get_game_deal.assert_not_awaited()
+    mock_bridge_client.get_self.assert_not_awaited()
+
+
 @pytest.mark.parametrize("event_type", ["turn", "call", "play"])
 def test_games_websocket_should_return_events(
     client, mock_event_receiver, game_id, event_type
@@ -549,6 +705,17 @@ def test_games_websocket_should_return_events(
     mock_event_receiver.get_event.assert_awaited()
 
 
+def test_games_websocket_should_subscribe_to_game_events(
+    client, mock_event_receiver, game_id
+):
+    event = events.BridgeEvent(game=game_id, type="turn")
+    mock_event_receiver.get_event.side_effect = itertools.repeat(event)
+    with client.websocket_connect(f"/api/v1/games/{game_id}/ws") as websocket:
+        _receive_event_helper(websocket)
+        mock_event_receiver.subscribe_game.assert_called_once_with(game_id)
+    mock_event_receiver.unsubscribe_game.assert_called_once_with(game_id)
+
+
 def test_games_websocket_should_return_multiple_events(
     client, mock_event_receiver, game_id
 ):
@@ -575,3 +742,145 @@ def test_games_websocket_should_demultiplex_events_from_different_games(
         with client.websocket_connect(f"/api/v1/games/{event.game}/ws") as websocket:
             assert _receive_event_helper(websocket) == _get_event(event.game, "event")
     mock_event_receiver.get_event.assert_awaited()
+
+
+async def test_event_demultiplexer_should_share_encoded_event_between_producers(
+    event_demultiplexer, mock_event_receiver, game_id
+):
+    event = events.BridgeEvent(game=game_id, type="turn")
+    events_ = iter([event])
+
+    async def get_event():
+        await asyncio.sleep(0)
+        return next(events_, events.BridgeEvent(game=uuid.uuid4(), type="turn"))
+
+    mock_event_receiver.get_event.side_effect = get_event
+    producers = [event_demultiplexer.subscribe(game_id) for _ in range(2)]
+    shared_events = [await producer.get_shared_event() for producer in producers]
+    encoder = unittest.mock.Mock(return_value=b"event")
+    assert [shared_event.encode("key", encoder) for shared_event in shared_events] == [
+        b"event",
+        b"event",
+    ]
+    encoder.assert_called_once_with(event)
+    for producer in producers:
+        event_demultiplexer.unsubscribe(producer)
+
+
+def _shared_event(game_id, counter):
+    return api._bridgeprotocol.SharedEvent(
+        events.BridgeEvent(game=game_id, type="turn", counter=counter)
+    )
+
+
+async def test_full_event_queue_should_be_replaced_with_resync_event(game_id):
+    producer = api._bridgeprotocol._EventProducer(game_id, maxsize=2)
+    for counter in range(3):
+        producer.produce(_shared_event(game_id, counter))
+    assert producer.queued_events == 1
+    assert producer.dropped_events == 3
+    assert await producer.get_event() == events.BridgeEvent(
+        game=game_id, type="resync", counter=2
+    )
+
+
+async def test_full_event_queue_should_disconnect_consumer(game_id):
+    producer = api._bridgeprotocol._EventProducer(
+        game_id, maxsize=2, overflow_policy="disconnect"
+    )
+    for counter in range(4):
+        producer.produce(_shared_event(game_id, counter))
+    assert producer.queued_events == 0
+    assert producer.dropped_events == 4
+    with pytest.raises(api._bridgeprotocol.EventQueueOverflowError):
+        await producer.get_event()
+
+
+async def test_event_demultiplexer_should_report_queue_stats(
+    mock_event_receiver, game_id
+):
+    async def get_event():
+        await asyncio.sleep(0)
+        return events.BridgeEvent(game=uuid.uuid4(), type="turn")
+
+    mock_event_receiver.get_event.side_effect = get_event
+    demultiplexer = api._bridgeprotocol.EventDemultiplexer(
+        mock_event_receiver, queue_size=2
+    )
+    producers = [demultiplexer.subscribe(game_id) for _ in range(2)]
+    producers[0].produce(_shared_event(game_id, 1))
+    for counter in range(3):
+        producers[1].produce(_shared_event(game_id, counter))
+    assert demultiplexer.queue_stats == api._bridgeprotocol.EventQueueStats(
+        producers=2, queued_events=2, max_queue_depth=1, dropped_events=3
+    )
+    for producer in producers:
+        demultiplexer.unsubscribe(producer)
+    assert demultiplexer.queue_stats == api._bridgeprotocol.EventQueueStats(
+        producers=0, queued_events=0, max_queue_depth=0, dropped_events=3
+    )
+
+
+def test_games_websocket_should_close_if_event_queue_overflows(
+    client, event_demultiplexer, mock_event_receiver, game_id
+):
+    event_demultiplexer._queue_size = 1
+    event_demultiplexer._overflow_policy = "disconnect"
+    mock_event_receiver.get_event.side_effect = itertools.repeat(
+        events.BridgeEvent(game=game_id, type="turn")
+    )
+    with client.websocket_connect(f"/api/v1/games/{game_id}/ws") as websocket:
+        with pytest.raises(fastapi.websockets.WebSocketDisconnect) as exc_info:
+            while True:
+                websocket.receive_bytes()
+    assert exc_info.value.code == fastapi.status.WS_1013_TRY_AGAIN_LATER
+
+
+@pytest.fixture
+def demultiplexer_with_history(mock_event_receiver, game_id):
+    """Yield event demultiplexer receiving events with counters 1, 2 and 3"""
+    events_ = iter(
+        events.BridgeEvent(game=game_id, type="turn", counter=counter)
+        for counter in range(1, 4)
+    )
+
+    async def get_event():
+        await asyncio.sleep(0)
+        return next(events_, events.BridgeEvent(game=uuid.uuid4(), type="turn"))
+
+    mock_event_receiver.get_event.side_effect = get_event
+    return api._bridgeprotocol.EventDemultiplexer(mock_event_receiver, history_size=2)
+
+
+async def test_subscribe_should_replay_missed_events(
+    demultiplexer_with_history, game_id
+):
+    producer = demultiplexer_with_history.subscribe(game_id)
+    for _ in range(3):
+        await producer.get_event()
+    resumed_producer = demultiplexer_with_history.subscribe(game_id, since=2)
+    assert resumed_producer.queued_events == 1
+    assert (await resumed_producer.get_event()).counter == 3
+    up_to_date_producer = demultiplexer_with_history.subscribe(game_id, since=3)
+    assert up_to_date_producer.queued_events == 0
+    for producer_ in [producer, resumed_producer, up_to_date_producer]:
+        demultiplexer_with_history.unsubscribe(producer_)
+
+
+async def test_subscribe_should_resync_if_missed_events_unknown(
+    demultiplexer_with_history, game_id
+):
+    producer = demultiplexer_with_history.subscribe(game_id)
+    for _ in range(3):
+        await producer.get_event()
+    resumed_producer = demultiplexer_with_history.subscribe(game_id, since=1)
+    assert await resumed_producer.get_event() == events.BridgeEvent(
+        game=game_id, type="resync", counter=3
+    )
+    for producer_ in [producer, resumed_producer]:
+        demultiplexer_with_history.unsubscribe(producer_)
+
+
+def test_games_websocket_should_resync_if_resumed_without_history(client, game_id):
+    with client.websocket_connect(f"/api/v1/games/{game_id}/ws?since=1") as websocket:
+        assert _receive_event_helper(websocket) == _get_event(game_id, "resync")
@@ -1,3 +1,4 @@
+import unittest.mock
 import uuid
 
 import asyncio
@@ -78,3 +79,84 @@ def test_change_password(client, credentials):
     assert res.status_code == fastapi.status.HTTP_204_NO_CONTENT
     res = client.get("/api/v1/players/me", auth=(credentials[0], new_password))
     assert res.status_code == fastapi.status.HTTP_200_OK
+
+
+def test_authentication_should_be_cached(monkeypatch, client, credentials):
+    load = unittest.mock.AsyncMock(wraps=dbu.load)
+    monkeypatch.setattr(dbu, "load", load)
+    for _ in range(3):
+        res = client.get("/api/v1/players/me", auth=credentials)
+        assert res.status_code == fastapi.status.HTTP_200_OK
+    load.assert_awaited_once()
+    assert api.auth._credentials_cache.hits == 2
+
+
+def test_cached_authentication_should_reject_wrong_password(client, credentials):
+    res = client.get("/api/v1/players/me", auth=credentials)
+    assert res.status_code == fastapi.status.HTTP_200_OK
+    res = client.get("/api/v1/players/me", auth=(credentials[0], "incorrect"))
+    assert res.status_code == fastapi.status.HTTP_401_UNAUTHORIZED
+
+
+def test_change_password_should_invalidate_cached_authentication(client, credentials):
+    res = client.patch(
+        "/api/v1/players/me", json={"password": "newpass"}, auth=credentials
+    )
+    assert res.status_code == fastapi.status.HTTP_204_NO_CONTENT
+    res = client.get("/api/v1/players/me", auth=credentials)
+    assert res.status_code == fastapi.status.HTTP_401_UNAUTHORIZED
+
+
+def test_create_player_should_fail_if_password_hashing_is_busy(
+    monkeypatch, database, client, username, password
+):
+    monkeypatch.setattr(api.password_utils._service, "_max_pending", 0)
+    player_create = api.models.PlayerCreate(username=username, password=password)
+    res = client.post("/api/v1/players", content=player_create.json())
+    assert res.status_code == fastapi.status.HTTP_503_SERVICE_UNAVAILABLE
+
+
+def _create_session(client, credentials):
+    res = client.post("/api/v1/players/me/sessions", auth=credentials)
+    assert res.status_code == fastapi.status.HTTP_201_CREATED
+    return api.models.Session(**res.json())
+
+
+def test_session_token_should_authenticate_without_database(
+    monkeypatch, client, credentials
+):
+    session = _create_session(client, credentials)
+    load = unittest.mock.AsyncMock(wraps=dbu.load)
+    monkeypatch.setattr(dbu, "load", load)
+    res = client.get(
+        "/api/v1/players/me", headers={"Authorization": f"Bearer {session.token}"}
+    )
+    assert res.status_code == fastapi.status.HTTP_200_OK
+    assert res.json()["username"] == credentials[0]
+    load.assert_not_awaited()
+
+
+def test_expired_session_token_should_be_rejected(monkeypatch, client, credentials):
+    monkeypatch.setattr(api.auth.settings, "session_ttl", -1)
+    session = _create_session(client, credentials)
+    res = client.get(
+        "/api/v1/players/me", headers={"Authorization": f"Bearer {session.token}"}
+    )
+    assert res.status_code == fastapi.status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.parametrize(
+    "tamper",
+    [
+        lambda token: token[:-2],
+        lambda token: token.replace(".", "x.", 1),
+        lambda token: "invalid",
+    ],
+)
+def test_tampered_session_token_should_be_rejected(client, credentials, tamper):
+    session = _create_session(client, credentials)
+    res = client.get(
+        "/api/v1/players/me",
+        headers={"Authorization": f"Bearer {tamper(session.token)}"},
+    )
+    assert res.status_code == fastapi.status.HTTP_401_UNAUTHORIZED
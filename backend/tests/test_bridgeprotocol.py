@@ -6,6 +6,8 @@ import asyncio
 import copy
 import itertools
 import random
+import sys
+import unittest.mock
 import uuid
 
 import pytest
@@ -262,6 +264,46 @@ async def test_client_should_handle_out_of_order_replies(server, client):
         assert await task == command_argument
 
 
+@pytest.mark.asyncio
+async def test_cancelled_command_should_be_reclaimed(server, client):
+    task = asyncio.create_task(client._raw_command(b"command", {}))
+    await server.get_command()
+    assert client.pending_commands == 1
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert client.pending_commands == 0
+
+
+@pytest.mark.asyncio
+async def test_command_should_time_out(server, client):
+    task = asyncio.create_task(client._raw_command(b"command", {}, timeout=0.01))
+    await server.get_command()
+    with pytest.raises(bridgeprotocol.CommandTimeoutError):
+        await task
+    assert client.pending_commands == 0
+
+
+@pytest.mark.asyncio
+async def test_client_should_not_reuse_tag_in_use(server, client):
+    status = b"OK"
+    command_arguments = [{b"arg": value} for value in [b"value1", b"value2"]]
+    tasks = []
+    tags = []
+    for command_argument in command_arguments:
+        tasks.append(
+            asyncio.create_task(client._raw_command(b"command", command_argument))
+        )
+        tag, _, _ = await server.get_command()
+        tags.append(tag)
+        # Simulate the counter wrapping around to the tag of the first command
+        client._counter = int.from_bytes(tags[0], byteorder=sys.byteorder)
+    assert tags[0] != tags[1]
+    for task, tag, command_argument in zip(tasks, tags, command_arguments):
+        await server.reply(tag, status, command_argument)
+        assert await task == command_argument
+
+
 @pytest.mark.asyncio
 async def test_reply_missing_status_should_raise_error(server, raw_command):
     tag, task = raw_command
@@ -898,6 +940,24 @@ async def test_event_receiver_with_curve(zmq_ctx, tmpdir, curve_keys):
             assert await event_receiver._get_raw_event() == (event, {})
 
 
+@pytest.mark.asyncio
+async def test_bridge_event_receiver_should_only_receive_subscribed_games(
+    zmq_ctx, server
+):
+    game_id, other_game_id = uuid.uuid4(), uuid.uuid4()
+    with bridgeprotocol.BridgeEventReceiver(
+        zmq_ctx, server.event_endpoint, subscribe_all=False
+    ) as event_receiver:
+        event_receiver.subscribe_game(game_id)
+        # Wait for the subscription to propagate to the publisher
+        await asyncio.sleep(0.03)
+        await server.send_event(f"{other_game_id}:event".encode(), {})
+        await server.send_event(f"{game_id}:event".encode(), {})
+        assert await event_receiver.get_event() == bridgeprotocol.BridgeEvent(
+            game=game_id, type="event"
+        )
+
+
 @pytest.mark.asyncio
 @pytest.mark.parametrize("event_type", ["event1", "event2"])
 @pytest.mark.parametrize("event_arguments", [{}, {"key": "value", "pi": 3.14}])
@@ -1022,6 +1082,47 @@ async def test_bridge_event_receiver_concrete_events(
     )
 
 
+def _mock_pooled_client(pending_commands):
+    return unittest.mock.Mock(
+        pending_commands=pending_commands, get_game=unittest.mock.AsyncMock()
+    )
+
+
+@pytest.mark.asyncio
+async def test_client_pool_should_dispatch_to_least_busy_client(game_id):
+    clients = [_mock_pooled_client(n) for n in [2, 0, 1]]
+    pool = bridgeprotocol.BridgeClientPool(clients)
+    await pool.get_game(game=game_id)
+    clients[0].get_game.assert_not_awaited()
+    clients[1].get_game.assert_awaited_once_with(game=game_id)
+    clients[2].get_game.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_client_pool_should_skip_unhealthy_client(game_id):
+    clients = [_mock_pooled_client(n) for n in [0, 1]]
+    clients[0].get_game.side_effect = bridgeprotocol.InvalidMessage
+    pool = bridgeprotocol.BridgeClientPool(clients, max_failures=2)
+    for _ in range(2):
+        with pytest.raises(bridgeprotocol.InvalidMessage):
+            await pool.get_game(game=game_id)
+    assert not pool.is_healthy(0)
+    await pool.get_game(game=game_id)
+    clients[1].get_game.assert_awaited_once_with(game=game_id)
+
+
+@pytest.mark.asyncio
+async def test_client_pool_command_failure_should_not_make_client_unhealthy(
+    game_id,
+):
+    clients = [_mock_pooled_client(0)]
+    clients[0].get_game.side_effect = bridgeprotocol.NotFoundError
+    pool = bridgeprotocol.BridgeClientPool(clients, max_failures=1)
+    with pytest.raises(bridgeprotocol.NotFoundError):
+        await pool.get_game(game=game_id)
+    assert pool.is_healthy(0)
+
+
 @pytest.mark.parametrize(
     "target,patch,result",
     [